@@ -4,6 +4,8 @@ Handles translation of final outputs to Hindi (hi) and Marathi (mr).
 Strategy: All reasoning in English, translate final output only.
 """
 
+from functools import lru_cache
+from typing import List, Tuple
 from models.schemas import Language
 
 
@@ -164,6 +166,23 @@ def translate_text(text: str, language: Language) -> str:
     return translated
 
 
+def translate_texts(texts: List[str], language: Language) -> List[str]:
+    """
+    Translate a batch of strings in one call, preserving order.
+    Callers collect every string for a response up front so a batch-capable
+    provider can serve them in a single request; results are memoized.
+    """
+    if language == Language.ENGLISH:
+        return list(texts)
+    return list(_translate_texts_cached(tuple(texts), language))
+
+
+@lru_cache(maxsize=256)
+def _translate_texts_cached(texts: Tuple[str, ...], language: Language) -> Tuple[str, ...]:
+    """Memoized batch translation keyed on the (hashable) input tuple."""
+    return tuple(translate_text(t, language) for t in texts)
+
+
 def translate_risk_level(level: str, language: Language) -> str:
     """Translate risk level label."""
     if language == Language.ENGLISH:
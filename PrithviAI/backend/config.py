@@ -4,6 +4,7 @@ Loads environment variables and defines app-wide settings.
 """
 
 import os
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -23,6 +24,14 @@ class Settings(BaseSettings):
     AQICN_API_KEY: str = os.getenv("AQICN_API_KEY", "")              # Free: 1000 calls/day
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")             # Free: 15 RPM, 1500 RPD
 
+    # --- Shared Cache (optional) ---
+    # Redis URL for the cross-worker AQI cache, e.g. redis://localhost:6379/0
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+
+    # --- Risk Engine ---
+    # Memoize compute_*_risk results (see intelligence/memo.py); PRITHVI_CACHE_RISK=0 disables
+    CACHE_RISK_FACTORS: bool = Field(True, validation_alias="PRITHVI_CACHE_RISK")
+
     # --- Database ---
     # JSON file-based storage (zero-cost, no external DB needed)
     DATA_DIR: str = os.getenv("DATA_DIR", "data")
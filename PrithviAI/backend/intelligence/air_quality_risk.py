@@ -4,9 +4,22 @@ Computes respiratory risk from PM2.5, PM10, and AQI data.
 Senior citizens have significantly lower tolerance thresholds.
 """
 
+import numpy as np
+from typing import Tuple
 from models.schemas import RiskFactor, RiskLevel, AgeGroup, ActivityIntent
+from intelligence.memo import risk_cache
 
+# Activity multiplier: higher exposure during physical activity
+_ACTIVITY_MULTIPLIERS = {
+    ActivityIntent.REST: 0.6,
+    ActivityIntent.WALKING: 1.0,
+    ActivityIntent.COMMUTE: 0.8,
+    ActivityIntent.OUTDOOR_WORK: 1.3,
+    ActivityIntent.EXERCISE: 1.5,
+}
 
+
+@risk_cache
 def compute_air_quality_risk(
     pm25: float,
     pm10: float,
@@ -29,14 +42,7 @@ def compute_air_quality_risk(
     age_factor = 0.7 if age_group == AgeGroup.ELDERLY else 1.0
     
     # Activity multiplier: higher exposure during physical activity
-    activity_multipliers = {
-        ActivityIntent.REST: 0.6,
-        ActivityIntent.WALKING: 1.0,
-        ActivityIntent.COMMUTE: 0.8,
-        ActivityIntent.OUTDOOR_WORK: 1.3,
-        ActivityIntent.EXERCISE: 1.5,
-    }
-    activity_factor = activity_multipliers.get(activity, 1.0)
+    activity_factor = _ACTIVITY_MULTIPLIERS.get(activity, 1.0)
     
     # ── PM2.5 Risk Score (0-100) ──
     # WHO guideline: 15 µg/m³ annual, 45 µg/m³ 24-hr
@@ -111,3 +117,40 @@ def compute_air_quality_risk(
         recommendation=recommendation,
         icon=icon,
     )
+
+
+# ── Vectorised batch scoring ──
+# The sub-score ladders above are continuous piecewise-linear curves, so they
+# are reproduced exactly by np.interp over their knots (the top segment ends
+# where it reaches the 100 cap). Inputs are non-negative measurements.
+_PM25_KNOTS = (np.array([0, 30, 60, 90, 150, 250.0]), np.array([0, 20, 50, 75, 90, 100.0]))
+_PM10_KNOTS = (np.array([0, 50, 100, 200, 400.0]), np.array([0, 15, 40, 70, 100.0]))
+_AQI_KNOTS = (np.array([0, 50, 100, 200, 500.0]), np.array([0, 15, 40, 75, 100.0]))
+
+# Level boundaries on the combined score: < 30 LOW, < 60 MODERATE, else HIGH
+_LEVEL_BOUNDS = np.array([30.0, 60.0])
+RISK_LEVEL_ORDER = (RiskLevel.LOW, RiskLevel.MODERATE, RiskLevel.HIGH)
+
+
+def compute_air_quality_scores(
+    pm25: np.ndarray,
+    pm10: np.ndarray,
+    aqi: np.ndarray,
+    age_group: AgeGroup = AgeGroup.ELDERLY,
+    activity: ActivityIntent = ActivityIntent.WALKING,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch version of compute_air_quality_risk for many readings at once
+    (multi-city views, backfills). Returns (scores, level_codes) where
+    level_codes index into RISK_LEVEL_ORDER. Scores are unrounded.
+    """
+    age_factor = 0.7 if age_group == AgeGroup.ELDERLY else 1.0
+    exposure = _ACTIVITY_MULTIPLIERS.get(activity, 1.0) / age_factor
+
+    pm25_score = np.interp(np.asarray(pm25, dtype=np.float64) * exposure, *_PM25_KNOTS)
+    pm10_score = np.interp(np.asarray(pm10, dtype=np.float64) * exposure, *_PM10_KNOTS)
+    aqi_score = np.interp(np.asarray(aqi, dtype=np.float64), *_AQI_KNOTS)
+
+    scores = np.clip(pm25_score * 0.50 + aqi_score * 0.30 + pm10_score * 0.20, 0, 100)
+    levels = np.searchsorted(_LEVEL_BOUNDS, scores, side="right").astype(np.int8)
+    return scores, levels
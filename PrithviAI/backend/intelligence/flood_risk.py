@@ -4,8 +4,10 @@ Computes fall risk and mobility hazards from waterlogging for seniors.
 """
 
 from models.schemas import RiskFactor, RiskLevel, AgeGroup, ActivityIntent
+from intelligence.memo import risk_cache
 
 
+@risk_cache
 def compute_flood_risk(
     rainfall: float,
     water_level: float = 0,
@@ -8,8 +8,10 @@ Computes health risks from humidity for seniors:
 """
 
 from models.schemas import RiskFactor, RiskLevel, AgeGroup
+from intelligence.memo import risk_cache
 
 
+@risk_cache
 def compute_humidity_risk(
     humidity: float,
     temperature: float,
@@ -0,0 +1,20 @@
+"""
+PrithviAI — Risk Factor Memoization
+The compute_*_risk functions are pure functions of a few floats and enums,
+and live readings repeat for a whole cache window (AQI/weather are cached
+upstream for 10+ minutes), so their RiskFactor results are memoized.
+Set PRITHVI_CACHE_RISK=0 to disable.
+"""
+
+from functools import lru_cache
+from config import settings
+
+
+def risk_cache(fn):
+    """LRU-cache a risk function's result unless disabled in settings.
+
+    Cached RiskFactor objects are shared between callers — copy before mutating.
+    """
+    if not settings.CACHE_RISK_FACTORS:
+        return fn
+    return lru_cache(maxsize=512)(fn)
@@ -3,9 +3,16 @@ PrithviAI — Noise Pollution Risk Assessment
 Computes noise impact on elderly health and sleep quality.
 """
 
+from bisect import bisect_right
 from models.schemas import RiskFactor, RiskLevel, AgeGroup, ActivityIntent
+from intelligence.memo import risk_cache
 
+# Score cut-offs between LOW / MODERATE / HIGH
+_LEVEL_BOUNDS = (30, 60)
+_LEVELS = (RiskLevel.LOW, RiskLevel.MODERATE, RiskLevel.HIGH)
 
+
+@risk_cache
 def compute_noise_risk(
     noise_db: float,
     age_group: AgeGroup = AgeGroup.ELDERLY,
@@ -53,12 +60,7 @@ def compute_noise_risk(
     score = min(max(score, 0), 100)
     
     # ── Risk Level ──
-    if score < 30:
-        level = RiskLevel.LOW
-    elif score < 60:
-        level = RiskLevel.MODERATE
-    else:
-        level = RiskLevel.HIGH
+    level = _LEVELS[bisect_right(_LEVEL_BOUNDS, score)]
     
     # ── Human-Readable Output ──
     if level == RiskLevel.LOW:
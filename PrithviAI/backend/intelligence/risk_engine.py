@@ -7,9 +7,9 @@ from typing import Optional
 from models.schemas import (
     EnvironmentData, SafetyIndex, RiskFactor, AgeGroup,
     ActivityIntent, SensorData, Forecast, ForecastPoint,
-    RiskLevel, DailySummary, HealthAlert,
+    RiskLevel, DailySummary, HealthAlert, ENV_COLS,
 )
-from intelligence.air_quality_risk import compute_air_quality_risk
+from intelligence.air_quality_risk import compute_air_quality_risk, compute_air_quality_scores
 from intelligence.thermal_risk import compute_thermal_risk
 from intelligence.humidity_risk import compute_humidity_risk
 from intelligence.noise_risk import compute_noise_risk
@@ -18,7 +18,8 @@ from intelligence.uv_risk import compute_uv_risk
 from intelligence.safety_index import compute_safety_index
 from intelligence.forecasting import generate_forecast
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Tuple
+import numpy as np
 
 
 class RiskEngine:
@@ -104,6 +105,26 @@ class RiskEngine:
         
         return safety_index
 
+    def score_air_quality_batch(
+        self,
+        env_rows: np.ndarray,
+        age_group: AgeGroup = AgeGroup.ELDERLY,
+        activity: ActivityIntent = ActivityIntent.WALKING,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Air quality scores for many locations at once.
+        env_rows is an (N, len(ENV_COLS)) matrix of EnvironmentData.to_array()
+        rows; returns (scores, level_codes) as compute_air_quality_scores does.
+        """
+        rows = np.atleast_2d(env_rows)
+        return compute_air_quality_scores(
+            rows[:, ENV_COLS.index("pm25")],
+            rows[:, ENV_COLS.index("pm10")],
+            rows[:, ENV_COLS.index("aqi")],
+            age_group=age_group,
+            activity=activity,
+        )
+
     def generate_daily_summary(
         self,
         env_data: EnvironmentData,
@@ -23,6 +23,15 @@ RISK_WEIGHTS = {
     "Noise Pollution": 0.10,
 }
 
+# Activity phrasing used in summary sentences
+_ACTIVITY_TEXT = {
+    ActivityIntent.WALKING: "going for a walk",
+    ActivityIntent.OUTDOOR_WORK: "outdoor work",
+    ActivityIntent.EXERCISE: "exercising outdoors",
+    ActivityIntent.COMMUTE: "commuting",
+    ActivityIntent.REST: "staying home",
+}
+
 
 def compute_safety_index(
     risk_factors: List[RiskFactor],
@@ -120,13 +129,7 @@ def _generate_summary(
     """Generate a human-readable summary sentence."""
     
     target = "seniors" if age_group == AgeGroup.ELDERLY else "adults"
-    activity_text = {
-        ActivityIntent.WALKING: "going for a walk",
-        ActivityIntent.OUTDOOR_WORK: "outdoor work",
-        ActivityIntent.EXERCISE: "exercising outdoors",
-        ActivityIntent.COMMUTE: "commuting",
-        ActivityIntent.REST: "staying home",
-    }.get(activity, "outdoor activity")
+    activity_text = _ACTIVITY_TEXT.get(activity, "outdoor activity")
     
     if level == RiskLevel.LOW:
         summary = f"Conditions are safe for {target} for {activity_text} today."
@@ -5,8 +5,19 @@ Uses simplified Heat Index approach adapted for senior safety.
 """
 
 from models.schemas import RiskFactor, RiskLevel, AgeGroup, ActivityIntent
+from intelligence.memo import risk_cache
 
+# Metabolic heat added by activity (°C of effective temperature)
+_ACTIVITY_HEAT_ADDITION = {
+    ActivityIntent.REST: 0,
+    ActivityIntent.WALKING: 2,
+    ActivityIntent.COMMUTE: 1,
+    ActivityIntent.OUTDOOR_WORK: 4,
+    ActivityIntent.EXERCISE: 5,
+}
 
+
+@risk_cache
 def compute_thermal_risk(
     temperature: float,
     humidity: float,
@@ -27,14 +38,7 @@ def compute_thermal_risk(
     """
     
     # ── Effective temperature accounting for activity ──
-    activity_heat_addition = {
-        ActivityIntent.REST: 0,
-        ActivityIntent.WALKING: 2,
-        ActivityIntent.COMMUTE: 1,
-        ActivityIntent.OUTDOOR_WORK: 4,
-        ActivityIntent.EXERCISE: 5,
-    }
-    heat_addition = activity_heat_addition.get(activity, 0)
+    heat_addition = _ACTIVITY_HEAT_ADDITION.get(activity, 0)
     
     # Wind chill factor: wind reduces perceived temperature
     wind_cooling = min(wind_speed * 0.5, 3)  # Cap at 3°C cooling
@@ -3,9 +3,25 @@ PrithviAI — UV Exposure Risk Assessment
 Computes UV radiation risk for skin and overall health of seniors.
 """
 
+from bisect import bisect_right
 from models.schemas import RiskFactor, RiskLevel, AgeGroup, ActivityIntent
+from intelligence.memo import risk_cache
 
+# Score cut-offs between LOW / MODERATE / HIGH
+_LEVEL_BOUNDS = (30, 60)
+_LEVELS = (RiskLevel.LOW, RiskLevel.MODERATE, RiskLevel.HIGH)
 
+# Activity exposure multiplier
+_ACTIVITY_EXPOSURE = {
+    ActivityIntent.REST: 0.3,        # Minimal outdoor exposure
+    ActivityIntent.COMMUTE: 0.6,     # Brief outdoor exposure
+    ActivityIntent.WALKING: 1.0,     # Standard outdoor exposure
+    ActivityIntent.OUTDOOR_WORK: 1.4, # Extended exposure
+    ActivityIntent.EXERCISE: 1.2,    # Moderate-extended exposure
+}
+
+
+@risk_cache
 def compute_uv_risk(
     uv_index: float,
     age_group: AgeGroup = AgeGroup.ELDERLY,
@@ -22,14 +38,7 @@ def compute_uv_risk(
     """
     
     # ── Activity exposure multiplier ──
-    activity_exposure = {
-        ActivityIntent.REST: 0.3,        # Minimal outdoor exposure
-        ActivityIntent.COMMUTE: 0.6,     # Brief outdoor exposure
-        ActivityIntent.WALKING: 1.0,     # Standard outdoor exposure
-        ActivityIntent.OUTDOOR_WORK: 1.4, # Extended exposure
-        ActivityIntent.EXERCISE: 1.2,    # Moderate-extended exposure
-    }
-    exposure = activity_exposure.get(activity, 1.0)
+    exposure = _ACTIVITY_EXPOSURE.get(activity, 1.0)
     
     # ── Effective UV (adjusted for age and activity) ──
     age_sensitivity = 1.3 if age_group == AgeGroup.ELDERLY else 1.0
@@ -50,12 +59,7 @@ def compute_uv_risk(
     score = min(max(score, 0), 100)
     
     # ── Risk Level ──
-    if score < 30:
-        level = RiskLevel.LOW
-    elif score < 60:
-        level = RiskLevel.MODERATE
-    else:
-        level = RiskLevel.HIGH
+    level = _LEVELS[bisect_right(_LEVEL_BOUNDS, score)]
     
     # ── Human-Readable Output ──
     if level == RiskLevel.LOW:
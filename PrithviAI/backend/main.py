@@ -3,6 +3,8 @@ PrithviAI — FastAPI Application Entry Point
 Main server configuration and startup.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -10,6 +12,7 @@ from contextlib import asynccontextmanager
 from config import settings
 from models.database import connect_db, disconnect_db
 from routes import environment, risk, chat, dashboard, map_explorer
+from services import air_quality_service, data_aggregator, http_client
 
 
 # ── Application Lifespan ──
@@ -18,6 +21,9 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     # Startup
     print(f"🌍 Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    # Worker pool for CPU-bound work offloaded via asyncio.to_thread
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=16))
+    clock_task = asyncio.create_task(data_aggregator.run_clock())
     try:
         await connect_db()
     except Exception as e:
@@ -27,6 +33,9 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    clock_task.cancel()
+    await air_quality_service.close_redis()
+    await http_client.close_all()
     await disconnect_db()
     print(f"🛑 {settings.APP_NAME} stopped")
 
@@ -3,10 +3,11 @@ PrithviAI — Pydantic Schemas
 Defines all request/response models for type safety and validation.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+import numpy as np
 
 
 # ─── Enums ───────────────────────────────────────────────
@@ -68,6 +69,18 @@ class EnvironmentData(BaseModel):
     weather_desc: str = Field("", description="Weather description")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+    def to_array(self) -> np.ndarray:
+        """Numeric readings as a float64 row in ENV_COLS order (for batch scoring)."""
+        values = self.__dict__
+        return np.array([values[col] for col in ENV_COLS], dtype=np.float64)
+
+
+# Column order of EnvironmentData.to_array() rows
+ENV_COLS = (
+    "pm25", "pm10", "aqi", "temperature", "feels_like", "humidity",
+    "wind_speed", "rainfall", "uv_index", "noise_db", "water_level",
+)
+
 
 # ─── Individual Risk Assessments ─────────────────────────
 
@@ -94,6 +107,22 @@ class SafetyIndex(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class DataQuality(BaseModel):
+    """Freshness and confidence metadata for a live assessment."""
+    freshness: dict
+    confidence: dict
+
+
+class RiskAssessmentResponse(SafetyIndex):
+    """Safety index returned by /api/risk/assess, with data quality metadata."""
+    data_quality: DataQuality
+
+    @field_serializer("timestamp")
+    def _serialize_timestamp(self, timestamp: datetime) -> str:
+        # Timestamps are naive UTC; mark them explicitly for clients
+        return timestamp.isoformat() + "Z"
+
+
 # ─── Forecast ────────────────────────────────────────────
 
 class ForecastPoint(BaseModel):
@@ -7,9 +7,8 @@ from fastapi import APIRouter, Query
 from typing import Optional
 from datetime import datetime, timedelta
 from models.schemas import RiskLevel, AgeGroup, ActivityIntent
-from services.data_aggregator import get_aggregated_environment
+from services.data_aggregator import get_aggregated_environment, get_aggregated_environments
 from intelligence.risk_engine import risk_engine
-import asyncio
 import traceback
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
@@ -30,9 +29,10 @@ async def get_dashboard_summary():
     Get dashboard overview — fetches LIVE environment data for each area,
     runs risk assessment, returns real-time safety scores.
     """
-    async def assess_area(area: dict) -> dict:
+    def assess_area(area: dict, env) -> dict:
         try:
-            env = await get_aggregated_environment(area["lat"], area["lon"], area["name"])
+            if isinstance(env, Exception):
+                raise env
             safety = risk_engine.compute_all_risks(
                 env_data=env,
                 age_group=AgeGroup.ELDERLY,
@@ -60,8 +60,11 @@ async def get_dashboard_summary():
                 "top_concern": "Data unavailable",
             }
 
-    # Fetch all areas in parallel for speed
-    areas = await asyncio.gather(*[assess_area(a) for a in DASHBOARD_AREAS])
+    # Fetch all areas in one batched gather for speed; failures come back per area
+    envs = await get_aggregated_environments(
+        [(a["lat"], a["lon"], a["name"]) for a in DASHBOARD_AREAS]
+    )
+    areas = [assess_area(a, env) for a, env in zip(DASHBOARD_AREAS, envs)]
 
     return {
         "current_time": datetime.utcnow().isoformat(),
@@ -5,30 +5,48 @@ Provides location-specific environmental data and AI-powered Q&A.
 """
 
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator, Tuple
 from datetime import datetime
+from collections import namedtuple
+import hashlib
+import logging
+import math
+import re
 import uuid
+import orjson
 
 from services.data_aggregator import get_aggregated_environment, get_aggregated_environment_with_quality
 from intelligence.risk_engine import risk_engine
 from intelligence.data_confidence import get_freshness_status, calculate_confidence_score
-from models.schemas import AgeGroup, Language, ActivityIntent, EnvironmentData, SafetyIndex
+from models.schemas import AgeGroup, Language, ActivityIntent, EnvironmentData, SafetyIndex, DataQuality
 from config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/map", tags=["Map Explorer"])
 
+# Gemini model singleton — configured once via _get_gemini_model()
+_gemini_model = None
+
 
 # ─── Request / Response Models ────────────────────────────
 
+class LocationDataQuality(DataQuality):
+    """Data quality metadata plus the per-field data sources."""
+    sources: dict
+
+
 class LocationDataResponse(BaseModel):
     """Full environmental + risk data for a single map location."""
     lat: float
     lon: float
     location_name: str
-    environment: dict
-    safety_index: dict
+    environment: EnvironmentData
+    safety_index: SafetyIndex
     timestamp: str
+    data_quality: LocationDataQuality
 
 
 class MapChatRequest(BaseModel):
@@ -67,13 +85,19 @@ LANDMARKS = [
 ]
 
 
+# Tuple form for internal lookups (attribute access, no per-item dict hashing);
+# the dict form above is kept for the /landmarks JSON response.
+Landmark = namedtuple("Landmark", "name lat lon type description")
+_LANDMARKS_T = tuple(Landmark(**lm) for lm in LANDMARKS)
+
+
 @router.get("/landmarks")
 async def get_landmarks():
     """Get predefined landmark locations for map markers."""
     return {"landmarks": LANDMARKS}
 
 
-@router.get("/location-data")
+@router.get("/location-data", response_model=LocationDataResponse)
 async def get_location_data(
     lat: float = Query(description="Latitude of the clicked location"),
     lon: float = Query(description="Longitude of the clicked location"),
@@ -105,22 +129,19 @@ async def get_location_data(
     freshness = get_freshness_status(env_data.timestamp)
     confidence = calculate_confidence_score(data_quality)
 
-    env_dict = env_data.model_dump()
-    safety_dict = safety_index.model_dump()
-
-    return {
-        "lat": lat,
-        "lon": lon,
-        "location_name": location_name,
-        "environment": env_dict,
-        "safety_index": safety_dict,
-        "timestamp": datetime.utcnow().isoformat(),
-        "data_quality": {
-            "freshness": freshness,
-            "confidence": confidence,
-            "sources": data_quality.get("data_sources", {}),
-        },
-    }
+    return LocationDataResponse(
+        lat=lat,
+        lon=lon,
+        location_name=location_name,
+        environment=env_data,
+        safety_index=safety_index,
+        timestamp=datetime.utcnow().isoformat(),
+        data_quality=LocationDataQuality(
+            freshness=freshness,
+            confidence=confidence,
+            sources=data_quality.get("data_sources", {}),
+        ),
+    )
 
 
 @router.post("/chat", response_model=MapChatResponse)
@@ -130,18 +151,7 @@ async def map_chat(request: MapChatRequest):
     Uses conversation history to provide non-repetitive, contextual answers.
     """
     session_id = request.session_id or str(uuid.uuid4())
-
-    # Fetch environmental data for the selected location
-    env_data = await get_aggregated_environment(
-        request.latitude, request.longitude, request.location_name,
-    )
-
-    # Compute risk assessment
-    safety_index = risk_engine.compute_all_risks(
-        env_data=env_data,
-        age_group=AgeGroup.ELDERLY if request.age_group == "elderly" else AgeGroup.ADULT,
-        activity=ActivityIntent.WALKING,
-    )
+    env_data, safety_index = await _prepare_map_chat(request)
 
     # Build AI response with location context and conversation history
     reply = await _generate_map_chat_response(
@@ -161,18 +171,68 @@ async def map_chat(request: MapChatRequest):
     )
 
 
+@router.post("/chat/stream")
+async def map_chat_stream(request: MapChatRequest):
+    """
+    Streaming variant of /chat, sent as Server-Sent Events.
+    Emits a `meta` event (risk_level, session_id) first, then `token` events
+    as Gemini generates text, then `done` — so the first words reach the
+    client before the full answer is ready.
+    """
+    session_id = request.session_id or str(uuid.uuid4())
+    env_data, safety_index = await _prepare_map_chat(request)
+
+    async def events():
+        yield _sse("meta", {
+            "risk_level": safety_index.overall_level.value,
+            "session_id": session_id,
+        })
+        async for text in _stream_map_chat_response(
+            user_message=request.message,
+            location_name=request.location_name,
+            lat=request.latitude,
+            lon=request.longitude,
+            env_data=env_data,
+            safety_index=safety_index,
+            conversation_history=request.conversation_history,
+        ):
+            yield _sse("token", {"text": text})
+        yield _sse("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def _prepare_map_chat(request: MapChatRequest) -> Tuple[EnvironmentData, SafetyIndex]:
+    """Fetch environment data and compute the risk assessment for a map chat request."""
+    # Fetch environmental data for the selected location
+    env_data = await get_aggregated_environment(
+        request.latitude, request.longitude, request.location_name,
+    )
+
+    # Compute risk assessment
+    safety_index = risk_engine.compute_all_risks(
+        env_data=env_data,
+        age_group=AgeGroup.ELDERLY if request.age_group == "elderly" else AgeGroup.ADULT,
+        activity=ActivityIntent.WALKING,
+    )
+    return env_data, safety_index
+
+
+def _sse(event: str, data: dict) -> bytes:
+    """Format a single Server-Sent Event."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
 def _find_nearest_landmark(lat: float, lon: float) -> str:
     """Find the nearest predefined landmark to the given coordinates."""
-    import math
-
     min_dist = float("inf")
     nearest = "Selected Location"
 
-    for lm in LANDMARKS:
-        dist = math.sqrt((lat - lm["lat"]) ** 2 + (lon - lm["lon"]) ** 2)
+    for lm in _LANDMARKS_T:
+        dist = math.hypot(lat - lm.lat, lon - lm.lon)
         if dist < min_dist:
             min_dist = dist
-            nearest = lm["name"]
+            nearest = lm.name
 
     # If too far from any landmark (>0.05 degrees ~ 5km), use generic name
     if min_dist > 0.05:
@@ -192,9 +252,9 @@ def _apply_location_variance(env_data: EnvironmentData, lat: float, lon: float)
     - Industrial zones (higher near refineries/ports)
     - Traffic density (higher in commercial hubs)
     - Green cover (lower near parks/gardens)
-    """
-    import hashlib, math
 
+    Does not mutate env_data — returns an adjusted copy.
+    """
     # Known zones with environmental modifiers (lat, lon, radius_deg, aqi_factor, label)
     ZONES = [
         # Green / low-pollution zones → cleaner air
@@ -217,7 +277,7 @@ def _apply_location_variance(env_data: EnvironmentData, lat: float, lon: float)
     # Calculate zone influence (distance-weighted)
     total_factor = 0.0
     for z_lat, z_lon, z_radius, z_factor, _label in ZONES:
-        dist = math.sqrt((lat - z_lat) ** 2 + (lon - z_lon) ** 2)
+        dist = math.hypot(lat - z_lat, lon - z_lon)
         if dist < z_radius:
             # Influence decreases linearly with distance from zone center
             influence = 1.0 - (dist / z_radius)
@@ -230,13 +290,85 @@ def _apply_location_variance(env_data: EnvironmentData, lat: float, lon: float)
     # Clamp total adjustment to ±35%
     adjustment = max(-0.35, min(0.35, total_factor + noise))
 
-    # Apply to AQI and PM values
-    base_aqi = env_data.aqi
-    env_data.aqi = max(10, round(base_aqi * (1 + adjustment)))
-    env_data.pm25 = max(1.0, round(env_data.pm25 * (1 + adjustment * 0.9), 1))
-    env_data.pm10 = max(2.0, round(env_data.pm10 * (1 + adjustment * 0.85), 1))
+    # Apply to AQI and PM values — one unvalidated copy, trusted derived values
+    return env_data.model_copy(update={
+        "aqi": max(10, round(env_data.aqi * (1 + adjustment))),
+        "pm25": max(1.0, round(env_data.pm25 * (1 + adjustment * 0.9), 1)),
+        "pm10": max(2.0, round(env_data.pm10 * (1 + adjustment * 0.85), 1)),
+    })
+
+
+# ─── Intent Pre-Classifier ───────────────────────────────
+# Short, single-metric questions ("what's the AQI?", "is it safe to walk?")
+# are answered from the template directly, skipping the Gemini round trip.
+# Open-ended questions fall through to Gemini.
+
+_INTENT_PATTERNS = [
+    (re.compile(r"\b(aqi|air quality|pollution|pm ?2\.?5|pm ?10)\b", re.I), "aqi"),
+    (re.compile(r"\b(temperature|temp|hot|heat)\b", re.I), "temperature"),
+    (re.compile(r"\b(humidity|humid)\b", re.I), "humidity"),
+    (re.compile(r"\b(uv|sunburn|sunscreen)\b", re.I), "uv"),
+    (re.compile(r"\b(noise|noisy|loud)\b", re.I), "noise"),
+    (re.compile(r"\bsafe\b.*\b(walk|go out|outside)\b", re.I), "safety"),
+]
+_INTENT_MAX_WORDS = 8  # Longer messages are treated as open-ended
+
+# Classification counters, logged to tune pattern coverage
+_intent_stats = {"classified": 0, "total": 0}
+
+
+def _classify_intent(message: str) -> Optional[str]:
+    """Return the intent for a short templated question, or None for open-ended ones."""
+    _intent_stats["total"] += 1
+    if len(message.split()) > _INTENT_MAX_WORDS:
+        return None
+    for pattern, intent in _INTENT_PATTERNS:
+        if pattern.search(message):
+            _intent_stats["classified"] += 1
+            return intent
+    return None
+
 
-    return env_data
+# ─── Gemini Prompt Templates ─────────────────────────────
+# Static prose is built once at import; only the dynamic fields are
+# interpolated per request.
+
+_SYSTEM_TMPL = """You are Prithvi Map Assistant — an environmental intelligence AI for the location "{location_name}" (lat: {lat:.4f}, lon: {lon:.4f}).
+
+CRITICAL RULES:
+1. Answer ONLY about the location "{location_name}" and its environmental conditions
+2. Give specific, actionable advice for elderly/senior citizens
+3. DO NOT repeat information from previous messages — vary your response style, focus, and phrasing
+4. Use the real-time data below — never invent numbers
+5. Keep responses concise (4-6 sentences max) with markdown formatting
+6. Include specific data points but present them naturally
+7. If asked about something not related to environment/safety, politely redirect
+8. Each response should have a DIFFERENT opening and structure than previous ones"""
+
+_GENERATION_CONFIG = {
+    "max_output_tokens": 400,
+    "temperature": 0.8,  # Slightly higher for variety
+}
+
+_HISTORY_HEADER = "\n\nPrevious conversation (DO NOT repeat these answers):\n"
+
+_DATA_TMPL = """Real-time data for {location_name}:
+- Temperature: {env.temperature:.1f}°C (feels like {env.feels_like:.1f}°C)
+- Air Quality Index (AQI): {env.aqi}
+- PM2.5: {env.pm25:.1f} µg/m³, PM10: {env.pm10:.1f} µg/m³
+- Humidity: {env.humidity:.1f}%
+- Wind Speed: {env.wind_speed:.1f} m/s
+- UV Index: {env.uv_index:.1f}
+- Rainfall: {env.rainfall:.1f} mm/hr
+- Noise Level: {env.noise_db:.1f} dB
+- Visibility: {env.visibility:.0f} m
+- Weather: {env.weather_desc}
+
+Risk Assessment:
+- Overall Risk: {overall_level} (score: {overall_score}/100)
+- Summary: {summary}
+- Top Risks: {top_risks}
+{history_text}"""
 
 
 async def _generate_map_chat_response(
@@ -250,11 +382,21 @@ async def _generate_map_chat_response(
 ) -> str:
     """
     Generate a contextual, non-repetitive AI response for the map chat.
-    Uses Gemini with conversation history to avoid repetition.
-    Falls back to a rich template if Gemini is unavailable.
+    Short single-metric questions are answered from a focused template.
+    Everything else uses Gemini with conversation history to avoid repetition,
+    falling back to a rich template if Gemini is unavailable.
     """
 
-    # Try Gemini-enhanced response first
+    # Simple single-metric questions are served by the template directly
+    intent = _classify_intent(user_message)
+    if intent:
+        logger.debug("[MapChat] Intent '%s' served from template (%s/%s classified)",
+                     intent, _intent_stats["classified"], _intent_stats["total"])
+        return _template_map_response(
+            user_message, location_name, env_data, safety_index, intent=intent,
+        )
+
+    # Try Gemini-enhanced response for open-ended questions
     if settings.GEMINI_API_KEY and len(settings.GEMINI_API_KEY) > 10:
         enhanced = await _gemini_map_chat(
             user_message, location_name, lat, lon,
@@ -269,7 +411,19 @@ async def _generate_map_chat_response(
     )
 
 
-async def _gemini_map_chat(
+def _get_gemini_model():
+    """Configure Gemini once and return the shared map chat model."""
+    global _gemini_model
+
+    if _gemini_model is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        _gemini_model = genai.GenerativeModel("gemini-2.0-flash")
+    return _gemini_model
+
+
+def _build_map_chat_prompt(
     user_message: str,
     location_name: str,
     lat: float,
@@ -277,61 +431,48 @@ async def _gemini_map_chat(
     env_data: EnvironmentData,
     safety_index: SafetyIndex,
     conversation_history: list,
-) -> Optional[str]:
-    """Use Gemini to generate location-aware, non-repetitive responses."""
-    try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-2.0-flash")
-
-        # Build conversation context to avoid repetition
-        history_text = ""
-        if conversation_history:
-            history_text = "\n\nPrevious conversation (DO NOT repeat these answers):\n"
-            for msg in conversation_history[-6:]:  # Last 6 messages for context
-                role = msg.get("role", "user")
-                content = msg.get("content", "")[:200]
-                history_text += f"- {role}: {content}\n"
-
-        system_prompt = f"""You are Prithvi Map Assistant — an environmental intelligence AI for the location "{location_name}" (lat: {lat:.4f}, lon: {lon:.4f}).
-
-CRITICAL RULES:
-1. Answer ONLY about the location "{location_name}" and its environmental conditions
-2. Give specific, actionable advice for elderly/senior citizens
-3. DO NOT repeat information from previous messages — vary your response style, focus, and phrasing
-4. Use the real-time data below — never invent numbers
-5. Keep responses concise (4-6 sentences max) with markdown formatting
-6. Include specific data points but present them naturally
-7. If asked about something not related to environment/safety, politely redirect
-8. Each response should have a DIFFERENT opening and structure than previous ones"""
+) -> str:
+    """Assemble the full Gemini prompt from the precompiled templates."""
+    # Build conversation context to avoid repetition (last 6 messages)
+    history_text = ""
+    if conversation_history:
+        history_text = _HISTORY_HEADER + "".join(
+            f"- {get('role', 'user')}: {get('content', '')[:200]}\n"
+            for get in (msg.get for msg in conversation_history[-6:])
+        )
 
-        data_context = f"""Real-time data for {location_name}:
-- Temperature: {env_data.temperature:.1f}°C (feels like {env_data.feels_like:.1f}°C)
-- Air Quality Index (AQI): {env_data.aqi}
-- PM2.5: {env_data.pm25:.1f} µg/m³, PM10: {env_data.pm10:.1f} µg/m³
-- Humidity: {env_data.humidity:.1f}%
-- Wind Speed: {env_data.wind_speed:.1f} m/s
-- UV Index: {env_data.uv_index:.1f}
-- Rainfall: {env_data.rainfall:.1f} mm/hr
-- Noise Level: {env_data.noise_db:.1f} dB
-- Visibility: {env_data.visibility:.0f} m
-- Weather: {env_data.weather_desc}
+    system_prompt = _SYSTEM_TMPL.format(location_name=location_name, lat=lat, lon=lon)
+    data_context = _DATA_TMPL.format(
+        location_name=location_name,
+        env=env_data,
+        overall_level=safety_index.overall_level.value,
+        overall_score=safety_index.overall_score,
+        summary=safety_index.summary,
+        top_risks=", ".join(f"{r.name}({r.level.value})" for r in safety_index.top_risks),
+        history_text=history_text,
+    )
 
-Risk Assessment:
-- Overall Risk: {safety_index.overall_level.value} (score: {safety_index.overall_score}/100)
-- Summary: {safety_index.summary}
-- Top Risks: {', '.join(f'{r.name}({r.level.value})' for r in safety_index.top_risks)}
-{history_text}"""
+    return f"{system_prompt}\n\n{data_context}\n\nUser question: {user_message}"
 
-        prompt = f"{system_prompt}\n\n{data_context}\n\nUser question: {user_message}"
 
-        response = await model.generate_content_async(
+async def _gemini_map_chat(
+    user_message: str,
+    location_name: str,
+    lat: float,
+    lon: float,
+    env_data: EnvironmentData,
+    safety_index: SafetyIndex,
+    conversation_history: list,
+) -> Optional[str]:
+    """Use Gemini to generate location-aware, non-repetitive responses."""
+    try:
+        prompt = _build_map_chat_prompt(
+            user_message, location_name, lat, lon,
+            env_data, safety_index, conversation_history,
+        )
+        response = await _get_gemini_model().generate_content_async(
             prompt,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=400,
-                temperature=0.8,  # Slightly higher for variety
-            ),
+            generation_config=_GENERATION_CONFIG,
         )
 
         return response.text
@@ -341,13 +482,82 @@ Risk Assessment:
         return None
 
 
+async def _stream_map_chat_response(
+    user_message: str,
+    location_name: str,
+    lat: float,
+    lon: float,
+    env_data: EnvironmentData,
+    safety_index: SafetyIndex,
+    conversation_history: list,
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of _generate_map_chat_response.
+    Templated answers are yielded whole; Gemini answers are yielded chunk by
+    chunk. Falls back to the template if Gemini fails before producing text.
+    """
+    intent = _classify_intent(user_message)
+    if not intent and settings.GEMINI_API_KEY and len(settings.GEMINI_API_KEY) > 10:
+        streamed = False
+        try:
+            prompt = _build_map_chat_prompt(
+                user_message, location_name, lat, lon,
+                env_data, safety_index, conversation_history,
+            )
+            stream = await _get_gemini_model().generate_content_async(
+                prompt,
+                generation_config=_GENERATION_CONFIG,
+                stream=True,
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    streamed = True
+                    yield chunk.text
+        except Exception as e:
+            print(f"[MapChat] Gemini stream failed: {e}")
+        if streamed:
+            return
+
+    yield _template_map_response(
+        user_message, location_name, env_data, safety_index, intent=intent,
+    )
+
+
+# Focused template per metric intent: (risk factor name, title, metrics line)
+_INTENT_METRICS = {
+    "aqi": ("Air Quality", "💨 Air Quality",
+            lambda e: f"AQI: {e.aqi} | PM2.5: {e.pm25:.0f} µg/m³ | PM10: {e.pm10:.0f} µg/m³"),
+    "temperature": ("Thermal Comfort", "🌡️ Temperature",
+                    lambda e: f"{e.temperature:.0f}°C (feels like {e.feels_like:.0f}°C)"),
+    "humidity": ("Humidity", "💧 Humidity",
+                 lambda e: f"Humidity: {e.humidity:.0f}% | Temperature: {e.temperature:.0f}°C"),
+    "uv": ("UV Exposure", "☀️ UV Index",
+           lambda e: f"UV Index: {e.uv_index:.1f}"),
+    "noise": ("Noise Pollution", "🔊 Noise",
+              lambda e: f"Noise Level: {e.noise_db:.0f} dB"),
+}
+
+
 def _template_map_response(
     user_message: str,
     location_name: str,
     env_data: EnvironmentData,
     safety_index: SafetyIndex,
+    intent: Optional[str] = None,
 ) -> str:
-    """Fallback template response when Gemini is unavailable."""
+    """
+    Template response, used when Gemini is unavailable or for a classified intent.
+    A metric intent ("aqi", "uv", ...) yields a focused answer; anything else
+    gets the full conditions overview.
+    """
+    if intent in _INTENT_METRICS:
+        risk_name, title, metrics = _INTENT_METRICS[intent]
+        risk = next((r for r in safety_index.all_risks if r.name == risk_name), None)
+        response = f"**{title} at {location_name}**\n\n• {metrics(env_data)}\n"
+        if risk:
+            response += f"\n{risk.icon} {risk.reason} {risk.recommendation}"
+        return response
+
     level = safety_index.overall_level.value
     emoji = {"LOW": "✅", "MODERATE": "⚠️", "HIGH": "🔴"}[level]
 
@@ -3,82 +3,129 @@ PrithviAI — Risk Assessment Routes
 Endpoints for computing risk assessments and safety index.
 """
 
+import asyncio
+import hashlib
 from fastapi import APIRouter
+from cachetools import TTLCache
 from models.schemas import (
-    RiskAssessmentRequest, SafetyIndex, HealthAlert,
+    RiskAssessmentRequest, SafetyIndex, HealthAlert, EnvironmentData,
+    RiskAssessmentResponse, DataQuality,
     AgeGroup, ActivityIntent, Language
 )
-from services.data_aggregator import get_aggregated_environment, get_aggregated_environment_with_quality
+from services.data_aggregator import get_aggregated_environment_with_quality
 from services.weather_service import fetch_weather_forecast, parse_forecast_to_env_list
 from intelligence.risk_engine import risk_engine
 from intelligence.data_confidence import get_freshness_status, calculate_confidence_score
-from chat.language import translate_text
-from typing import List
+from chat.language import translate_texts
+from typing import List, Tuple
 
 router = APIRouter(prefix="/api/risk", tags=["Risk Assessment"])
 
+# Short-lived cache of (env_data, data_quality, safety_index) so a client calling
+# /assess, /alerts and /daily-summary for the same location computes it once.
+_risk_cache = TTLCache(maxsize=512, ttl=30)
 
-@router.post("/assess")
-async def assess_risk(request: RiskAssessmentRequest):
+
+def _risk_cache_key(request: RiskAssessmentRequest) -> tuple:
+    """Cache key over everything that affects the aggregated data and risk result."""
+    sensor_hash = None
+    if request.sensor_data:
+        sensor_hash = hashlib.blake2b(
+            request.sensor_data.model_dump_json().encode(), digest_size=8
+        ).hexdigest()
+    return (
+        round(request.latitude, 4),
+        round(request.longitude, 4),
+        request.city,
+        sensor_hash,
+        request.age_group,
+        request.activity,
+    )
+
+
+async def _compute(request: RiskAssessmentRequest) -> Tuple[EnvironmentData, dict, SafetyIndex]:
     """
-    Compute full risk assessment and Senior Environmental Safety Index.
-    Includes data_quality metadata for confidence indicators.
+    Fetch aggregated environment data and compute the safety index, memoized
+    for a short window. Cached objects are shared — callers must not mutate them.
     """
-    # Get aggregated environmental data + quality context
+    cache_key = _risk_cache_key(request)
+    if cache_key in _risk_cache:
+        return _risk_cache[cache_key]
+
     env_data, data_quality = await get_aggregated_environment_with_quality(
         lat=request.latitude,
         lon=request.longitude,
         city=request.city,
         sensor_data=request.sensor_data,
     )
-    
-    # Compute safety index
-    safety_index = risk_engine.compute_all_risks(
-        env_data=env_data,
-        age_group=request.age_group,
-        activity=request.activity,
+    # Risk computation is CPU work — run it off the event loop
+    safety_index = await asyncio.to_thread(
+        risk_engine.compute_all_risks,
+        env_data,
+        request.age_group,
+        request.activity,
     )
+
+    result = (env_data, data_quality, safety_index)
+    _risk_cache[cache_key] = result
+    return result
+
+
+def _translate_safety_index(safety_index: SafetyIndex, language: Language) -> SafetyIndex:
+    """Return a translated deep copy of the safety index (runs in a worker thread)."""
+    safety_index = safety_index.model_copy(deep=True)
+    risks = safety_index.all_risks
+    n = len(risks)
+
+    # One batched call: [summary, reasons..., recommendations..., names..., recs...]
+    translated = translate_texts(
+        [safety_index.summary]
+        + [r.reason for r in risks]
+        + [r.recommendation for r in risks]
+        + [r.name for r in risks]
+        + safety_index.recommendations,
+        language,
+    )
+
+    safety_index.summary = translated[0]
+    for i, risk in enumerate(risks, start=1):
+        risk.reason = translated[i]
+        risk.recommendation = translated[i + n]
+        risk.name = translated[i + 2 * n]
+    safety_index.recommendations = translated[1 + 3 * n:]
+    return safety_index
+
+
+@router.post("/assess", response_model=RiskAssessmentResponse)
+async def assess_risk(request: RiskAssessmentRequest):
+    """
+    Compute full risk assessment and Senior Environmental Safety Index.
+    Includes data_quality metadata for confidence indicators.
+    """
+    # Get aggregated environmental data + quality context + safety index
+    env_data, data_quality, safety_index = await _compute(request)
     
-    # Translate if needed
+    # Translate if needed (on a copy — the cached index is shared)
     if request.language != Language.ENGLISH:
-        safety_index.summary = translate_text(safety_index.summary, request.language)
-        for risk in safety_index.all_risks:
-            risk.reason = translate_text(risk.reason, request.language)
-            risk.recommendation = translate_text(risk.recommendation, request.language)
-            risk.name = translate_text(risk.name, request.language)
-        safety_index.recommendations = [
-            translate_text(r, request.language) for r in safety_index.recommendations
-        ]
+        safety_index = await asyncio.to_thread(
+            _translate_safety_index, safety_index, request.language
+        )
     
     # Compute freshness & confidence
     freshness = get_freshness_status(env_data.timestamp)
     confidence = calculate_confidence_score(data_quality)
 
     # Return safety index + quality metadata
-    result = safety_index.model_dump()
-    result["timestamp"] = safety_index.timestamp.isoformat() + "Z" if safety_index.timestamp else None
-    result["data_quality"] = {
-        "freshness": freshness,
-        "confidence": confidence,
-    }
-    return result
+    return RiskAssessmentResponse(
+        **dict(safety_index),
+        data_quality=DataQuality(freshness=freshness, confidence=confidence),
+    )
 
 
 @router.post("/alerts", response_model=List[HealthAlert])
 async def get_alerts(request: RiskAssessmentRequest):
     """Get proactive health alerts based on current conditions."""
-    env_data = await get_aggregated_environment(
-        lat=request.latitude,
-        lon=request.longitude,
-        city=request.city,
-        sensor_data=request.sensor_data,
-    )
-    
-    safety_index = risk_engine.compute_all_risks(
-        env_data=env_data,
-        age_group=request.age_group,
-        activity=request.activity,
-    )
+    _, _, safety_index = await _compute(request)
     
     alerts = risk_engine.generate_alerts(safety_index, request.age_group)
     return alerts
@@ -87,15 +134,11 @@ async def get_alerts(request: RiskAssessmentRequest):
 @router.post("/daily-summary")
 async def get_daily_summary(request: RiskAssessmentRequest):
     """Get the full daily environmental safety summary."""
-    env_data = await get_aggregated_environment(
-        lat=request.latitude,
-        lon=request.longitude,
-        city=request.city,
-        sensor_data=request.sensor_data,
+    # Current conditions and forecast are independent — fetch them concurrently
+    (env_data, _, _), forecast_raw = await asyncio.gather(
+        _compute(request),
+        fetch_weather_forecast(request.latitude, request.longitude),
     )
-    
-    # Get forecast data
-    forecast_raw = await fetch_weather_forecast(request.latitude, request.longitude)
     forecast_env = parse_forecast_to_env_list(forecast_raw)
     
     daily_summary = risk_engine.generate_daily_summary(
@@ -7,11 +7,56 @@ Uses geo-based lookups so each location gets its own AQI.
 
 import httpx
 import asyncio
+import logging
+import math
+import struct
+from bisect import bisect_left
+from types import MappingProxyType
+import numpy as np
+import orjson
+from typing import Optional, Tuple, List
 from cachetools import TTLCache
 from config import settings
-
-# Cache AQI data for 10 minutes — keyed by rounded lat/lon
-_aqi_cache = TTLCache(maxsize=200, ttl=600)
+from services import http_client
+from services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Cache AQI data for 10 minutes — keyed by ~2 km grid tile.
+# Entries are (lat, lon, result); a lookup probes the 3x3 neighbouring tiles and
+# accepts any entry within _CACHE_RADIUS_KM, so GPS jitter still hits the cache.
+_AQI_TTL = 600
+_aqi_cache = TTLCache(maxsize=200, ttl=_AQI_TTL)
+_TILE = 0.02            # degrees (~2 km)
+_CACHE_RADIUS_KM = 2.0
+
+# In-flight fetches per tile, tagged with their (lat, lon). Joined with the same
+# 3x3 / _CACHE_RADIUS_KM rule as the cache, so nearby misses share one upstream call
+_flights = SingleFlight()
+
+# Optional L2 cache shared across workers (enabled by REDIS_URL)
+_redis = None
+_redis_checked = False
+
+# Pooled client options: trust_env=False skips the proxy/cert env-var scan, and
+# the transport retries a failed connect once so a stale keep-alive socket
+# doesn't fail the request
+_HTTP_OPTIONS = dict(
+    trust_env=False,
+    timeout=httpx.Timeout(10.0, connect=3.0),
+    retries=1,
+    max_connections=20,
+    max_keepalive_connections=20,
+    keepalive_expiry=30,
+)
+
+
+async def close_redis() -> None:
+    """Close the Redis L2 connection (called on app shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
 
 
 async def fetch_air_quality(
@@ -35,35 +80,142 @@ async def fetch_air_quality(
     lat = lat or settings.DEFAULT_LAT
     lon = lon or settings.DEFAULT_LON
 
-    cache_key = f"aqi_{lat:.3f}_{lon:.3f}"
-    if cache_key in _aqi_cache:
-        return _aqi_cache[cache_key]
+    cached = _cache_lookup(lat, lon)
+    if cached is not None:
+        return cached
+
+    cache_key = _tile_key(lat, lon)
+    return await _flights.run(
+        cache_key,
+        lambda: _fetch_and_cache(lat, lon, cache_key),
+        meta=(lat, lon),
+        probe=lambda: _inflight_lookup(lat, lon),
+    )
+
+
+async def _fetch_and_cache(lat: float, lon: float, cache_key: Tuple[int, int]) -> dict:
+    """Resolve a cache miss: L2 lookup, then fetch both sources, merge and store."""
+    # L2: shared Redis cache (other workers may have fetched this tile already)
+    cached = await _redis_lookup(lat, lon)
+    if cached is not None:
+        return cached
 
     # Fetch from BOTH sources in parallel for accuracy
-    aqicn_data = None
-    owm_data = None
-
-    tasks = []
-    if settings.AQICN_API_KEY:
-        tasks.append(("aqicn", _fetch_from_aqicn_geo(lat, lon)))
-    if settings.OPENWEATHER_API_KEY:
-        tasks.append(("owm", _fetch_from_openweather(lat, lon)))
-
-    if tasks:
-        results = await asyncio.gather(*[t[1] for t in tasks], return_exceptions=True)
-        for i, (name, _) in enumerate(tasks):
-            if not isinstance(results[i], Exception) and results[i] is not None:
-                if name == "aqicn":
-                    aqicn_data = results[i]
-                else:
-                    owm_data = results[i]
+    aqicn_coro = _fetch_from_aqicn_geo(lat, lon) if settings.AQICN_API_KEY else None
+    owm_coro = _fetch_from_openweather(lat, lon) if settings.OPENWEATHER_API_KEY else None
+    coros = [c for c in (aqicn_coro, owm_coro) if c is not None]
+    results = iter(await asyncio.gather(*coros, return_exceptions=True) if coros else ())
+
+    # Results come back in call order — unpack positionally
+    aqicn_data = next(results) if aqicn_coro is not None else None
+    owm_data = next(results) if owm_coro is not None else None
+    if isinstance(aqicn_data, Exception):
+        aqicn_data = None
+    if isinstance(owm_data, Exception):
+        owm_data = None
 
     # Cross-validate and merge
     merged = _merge_air_quality(aqicn_data, owm_data, lat, lon)
-    _aqi_cache[cache_key] = merged
+    _aqi_cache[cache_key] = (lat, lon, merged)
+    if merged.get("source") != "demo":
+        await _redis_store(cache_key, lat, lon, merged)
     return merged
 
 
+def _tile_key(lat: float, lon: float) -> Tuple[int, int]:
+    """Grid tile containing the point."""
+    return (math.floor(lat / _TILE), math.floor(lon / _TILE))
+
+
+def _neighbour_keys(lat: float, lon: float) -> List[Tuple[int, int]]:
+    """The point's tile and its 8 neighbours."""
+    key_lat, key_lon = _tile_key(lat, lon)
+    return [(key_lat + dx, key_lon + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def _cache_lookup(lat: float, lon: float) -> Optional[dict]:
+    """Return a cached result from this or a neighbouring tile within _CACHE_RADIUS_KM."""
+    for key in _neighbour_keys(lat, lon):
+        entry = _aqi_cache.get(key)
+        if entry is not None and _haversine_km(lat, lon, entry[0], entry[1]) <= _CACHE_RADIUS_KM:
+            return entry[2]
+    return None
+
+
+def _inflight_lookup(lat: float, lon: float) -> Optional[asyncio.Future]:
+    """In-flight fetch from this or a neighbouring tile within _CACHE_RADIUS_KM."""
+    return _flights.lookup(
+        _neighbour_keys(lat, lon),
+        lambda origin: _haversine_km(lat, lon, *origin) <= _CACHE_RADIUS_KM,
+    )
+
+
+def _get_redis():
+    """Lazily connect the optional Redis L2 cache. Returns None when not configured."""
+    global _redis, _redis_checked
+    if not _redis_checked:
+        _redis_checked = True
+        if settings.REDIS_URL:
+            try:
+                import redis.asyncio as redis_asyncio
+                _redis = redis_asyncio.Redis.from_url(settings.REDIS_URL)
+            except ImportError:
+                logger.warning("[AQI] REDIS_URL set but redis package not installed — L2 cache disabled")
+    return _redis
+
+
+def _redis_key(key: Tuple[int, int]) -> str:
+    return f"aqi:{key[0]}:{key[1]}"
+
+
+async def _redis_lookup(lat: float, lon: float) -> Optional[dict]:
+    """Probe the neighbouring tiles in Redis with one MGET; populate L1 on a hit."""
+    redis = _get_redis()
+    if redis is None:
+        return None
+    keys = _neighbour_keys(lat, lon)
+    try:
+        raws = await redis.mget([_redis_key(k) for k in keys])
+    except Exception as e:
+        logger.warning("[AQI] Redis lookup error: %s", e)
+        return None
+    for key, raw in zip(keys, raws):
+        if raw is None:
+            continue
+        try:
+            entry = orjson.loads(raw)
+            entry_lat, entry_lon, result = entry["lat"], entry["lon"], entry["result"]
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+            # Corrupt or foreign value under our key — treat as a miss
+            logger.warning("[AQI] Ignoring unreadable Redis entry %s: %s", _redis_key(key), e)
+            continue
+        if _haversine_km(lat, lon, entry_lat, entry_lon) <= _CACHE_RADIUS_KM:
+            _aqi_cache[key] = (entry_lat, entry_lon, result)
+            return result
+    return None
+
+
+async def _redis_store(key: Tuple[int, int], lat: float, lon: float, result: dict) -> None:
+    """Write a fetched result to Redis with the same TTL as the L1 cache."""
+    redis = _get_redis()
+    if redis is None:
+        return
+    try:
+        payload = orjson.dumps({"lat": lat, "lon": lon, "result": result})
+        await redis.set(_redis_key(key), payload, ex=_AQI_TTL)
+    except Exception as e:
+        logger.warning("[AQI] Redis store error: %s", e)
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in km."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
 def _merge_air_quality(aqicn: dict, owm: dict, lat: float, lon: float) -> dict:
     """
     Merge AQICN + OpenWeatherMap data for maximum accuracy.
@@ -88,9 +240,11 @@ def _merge_air_quality(aqicn: dict, owm: dict, lat: float, lon: float) -> dict:
         final_aqi = max(final_aqi, pm10_aqi)
 
         station = aqicn.get("station", "")
-        print(f"[AQI] MERGED: aqicn_aqi={aqicn_aqi}, owm_pm25={pm25_ugm3}µg/m³, "
-              f"computed_aqi={computed_aqi}, pm10_aqi={pm10_aqi}, final_aqi={final_aqi}, "
-              f"station={station}")
+        logger.debug(
+            "[AQI] MERGED: aqicn_aqi=%s, owm_pm25=%sµg/m³, computed_aqi=%s, "
+            "pm10_aqi=%s, final_aqi=%s, station=%s",
+            aqicn_aqi, pm25_ugm3, computed_aqi, pm10_aqi, final_aqi, station,
+        )
 
         return {
             "aqi": final_aqi,
@@ -111,7 +265,7 @@ def _merge_air_quality(aqicn: dict, owm: dict, lat: float, lon: float) -> dict:
         aqi_pm25 = _compute_aqi_from_pm25(pm25)
         aqi_pm10 = _compute_aqi_from_pm10(pm10)
         final_aqi = max(aqi_pm25, aqi_pm10)
-        print(f"[AQI] OWM only: pm25={pm25}µg/m³, aqi={final_aqi}")
+        logger.debug("[AQI] OWM only: pm25=%sµg/m³, aqi=%s", pm25, final_aqi)
         return {
             "aqi": final_aqi,
             "pm25": round(pm25, 1),
@@ -129,21 +283,24 @@ def _merge_air_quality(aqicn: dict, owm: dict, lat: float, lon: float) -> dict:
         pm25_subindex = aqicn.get("pm25", 0)
         pm10_subindex = aqicn.get("pm10", 0)
 
-        # Convert AQI sub-indices back to approximate concentrations
+        # Convert AQI sub-indices back to approximate concentrations (display only)
         pm25_ugm3 = _aqi_to_pm25(pm25_subindex)
         pm10_ugm3 = _aqi_to_pm10(pm10_subindex)
 
-        # Recompute AQI from concentrations and take max with station AQI
-        computed_aqi = max(_compute_aqi_from_pm25(pm25_ugm3), _compute_aqi_from_pm10(pm10_ugm3))
-        final_aqi = max(aqicn_aqi, computed_aqi)
+        # The sub-indices already are AQI values — no need to round-trip them
+        # through concentrations to compare against the station AQI. They can be
+        # fractional, so round them to whole AQI points like the round trip did
+        final_aqi = max(aqicn_aqi, int(pm25_subindex + 0.5), int(pm10_subindex + 0.5))
 
-        print(f"[AQI] AQICN only: station_aqi={aqicn_aqi}, pm25_sub={pm25_subindex}→{pm25_ugm3}µg/m³, "
-              f"pm10_sub={pm10_subindex}→{pm10_ugm3}µg/m³, final_aqi={final_aqi}")
+        logger.debug(
+            "[AQI] AQICN only: station_aqi=%s, pm25_sub=%s→%sµg/m³, pm10_sub=%s→%sµg/m³, final_aqi=%s",
+            aqicn_aqi, pm25_subindex, pm25_ugm3, pm10_subindex, pm10_ugm3, final_aqi,
+        )
 
         return {
             "aqi": final_aqi,
-            "pm25": round(pm25_ugm3, 1),
-            "pm10": round(pm10_ugm3, 1),
+            "pm25": pm25_ugm3,    # already rounded to 0.1 by _aqi_to_pm25
+            "pm10": pm10_ugm3,
             "no2": aqicn.get("no2", 0),
             "so2": aqicn.get("so2", 0),
             "co": aqicn.get("co", 0),
@@ -158,38 +315,41 @@ def _merge_air_quality(aqicn: dict, owm: dict, lat: float, lon: float) -> dict:
         return demo
 
 
+# ── Upstream payload field access ──
+# Missing keys fall back to these shared immutable sentinels instead of a fresh
+# {} / [{}] per .get(), and pollutant fields are read in one loop.
+_EMPTY = MappingProxyType({})
+_EMPTY_LIST_ENTRY = (_EMPTY,)
+_POLLUTANTS = ("pm25", "pm10", "no2", "so2", "co", "o3")
+_OWM_COMPONENT_KEYS = ("pm2_5", "pm10", "no2", "so2", "co", "o3")
+
+
 async def _fetch_from_aqicn_geo(lat: float, lon: float) -> dict:
     """Fetch from AQICN using geo-coordinates (nearest monitoring station)."""
     url = f"https://api.waqi.info/feed/geo:{lat};{lon}/"
     params = {"token": settings.AQICN_API_KEY}
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") == "ok":
-                aqi_data = data.get("data", {})
-                iaqi = aqi_data.get("iaqi", {})
-                station = aqi_data.get("city", {}).get("name", "unknown")
-
-                print(f"[AQI] AQICN geo hit: station={station}, aqi={aqi_data.get('aqi')}")
-
-                # NOTE: iaqi values are AQI sub-indices (0-500), NOT µg/m³
-                return {
-                    "aqi": aqi_data.get("aqi", 0),
-                    "pm25": iaqi.get("pm25", {}).get("v", 0),  # Sub-index
-                    "pm10": iaqi.get("pm10", {}).get("v", 0),  # Sub-index
-                    "no2": iaqi.get("no2", {}).get("v", 0),
-                    "so2": iaqi.get("so2", {}).get("v", 0),
-                    "co": iaqi.get("co", {}).get("v", 0),
-                    "o3": iaqi.get("o3", {}).get("v", 0),
-                    "station": station,
-                    "source": "aqicn",
-                }
+        client = http_client.get_client("air_quality", **_HTTP_OPTIONS)
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        if data.get("status") == "ok":
+            aqi_data = data.get("data", _EMPTY)
+            iaqi = aqi_data.get("iaqi", _EMPTY)
+            station = aqi_data.get("city", _EMPTY).get("name", "unknown")
+
+            logger.debug("[AQI] AQICN geo hit: station=%s, aqi=%s", station, aqi_data.get("aqi"))
+
+            # NOTE: iaqi values are AQI sub-indices (0-500), NOT µg/m³
+            result = {name: iaqi.get(name, _EMPTY).get("v", 0) for name in _POLLUTANTS}
+            result["aqi"] = aqi_data.get("aqi", 0)
+            result["station"] = station
+            result["source"] = "aqicn"
+            return result
     except Exception as e:
-        print(f"[AQI] AQICN geo API error: {e}")
+        logger.warning("[AQI] AQICN geo API error: %s", e)
 
     return None
 
@@ -204,79 +364,133 @@ async def _fetch_from_openweather(lat: float, lon: float) -> dict:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            components = data.get("list", [{}])[0].get("components", {})
-            pm25 = components.get("pm2_5", 0)
-            pm10 = components.get("pm10", 0)
-
-            print(f"[AQI] OWM raw: pm2.5={pm25}µg/m³, pm10={pm10}µg/m³")
-
-            return {
-                "pm25": pm25,
-                "pm10": pm10,
-                "no2": components.get("no2", 0),
-                "so2": components.get("so2", 0),
-                "co": components.get("co", 0),
-                "o3": components.get("o3", 0),
-                "source": "openweathermap",
-            }
+        client = http_client.get_client("air_quality", **_HTTP_OPTIONS)
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        entries = data.get("list", _EMPTY_LIST_ENTRY)
+        components = entries[0].get("components", _EMPTY)
+        result = {
+            name: components.get(key, 0)
+            for name, key in zip(_POLLUTANTS, _OWM_COMPONENT_KEYS)
+        }
+        result["source"] = "openweathermap"
+
+        logger.debug("[AQI] OWM raw: pm2.5=%sµg/m³, pm10=%sµg/m³", result["pm25"], result["pm10"])
+
+        return result
     except Exception as e:
-        print(f"[AQI] OpenWeatherMap Air Pollution API error: {e}")
+        logger.warning("[AQI] OpenWeatherMap Air Pollution API error: %s", e)
 
     return None
 
 
-def _compute_aqi_from_pm25(pm25: float) -> int:
+# ── US EPA breakpoints: (conc_lo, conc_hi, aqi_lo, aqi_hi) ──
+# Immutable module constants — built once, never per call.
+_PM25_BREAKPOINTS = (
+    (0.0,   12.0,    0,  50),
+    (12.1,  35.4,   51, 100),
+    (35.5,  55.4,  101, 150),
+    (55.5, 150.4,  151, 200),
+    (150.5, 250.4, 201, 300),
+    (250.5, 350.4, 301, 400),
+    (350.5, 500.4, 401, 500),
+)
+
+_PM10_BREAKPOINTS = (
+    (0,    54,     0,  50),
+    (55,   154,   51, 100),
+    (155,  254,  101, 150),
+    (255,  354,  151, 200),
+    (355,  424,  201, 300),
+    (425,  504,  301, 400),
+    (505,  604,  401, 500),
+)
+
+
+def _interp_table(breakpoints) -> tuple:
     """
-    Convert PM2.5 concentration (µg/m³) to US EPA AQI using standard breakpoints.
-    This gives a proper 0-500 AQI scale.
+    Flatten breakpoint rows into np.interp knot arrays (conc, aqi).
+    Both endpoints of every row are kept, so the piecewise-linear interpolant
+    reproduces EPA's per-segment formula exactly.
     """
-    if pm25 < 0:
+    conc = np.array([c for c_lo, c_hi, _, _ in breakpoints for c in (c_lo, c_hi)], dtype=np.float64)
+    aqi = np.array([a for _, _, a_lo, a_hi in breakpoints for a in (a_lo, a_hi)], dtype=np.float64)
+    return conc, aqi
+
+
+_PM25_CONC, _PM25_AQI = _interp_table(_PM25_BREAKPOINTS)
+_PM10_CONC, _PM10_AQI = _interp_table(_PM10_BREAKPOINTS)
+
+
+# ── Precomputed concentration → AQI lookup tables ──
+# EPA truncates PM readings to 0.1 µg/m³ before looking up the breakpoint, so
+# the whole mapping fits in a small array indexed by int(conc * 10). Built once
+# at import; every conversion afterwards is a single indexed load.
+_LUT_SCALE = 10
+_LUT_EPS = 1e-9   # guards int() against 0.29999… style float error
+
+
+def _build_aqi_lut(conc: np.ndarray, aqi: np.ndarray) -> np.ndarray:
+    grid = np.arange(int(conc[-1] * _LUT_SCALE) + 1) / _LUT_SCALE
+    return (np.interp(grid, conc, aqi) + 0.5).astype(np.uint16)
+
+
+_PM25_AQI_LUT = _build_aqi_lut(_PM25_CONC, _PM25_AQI)   # 0.0–500.4 µg/m³
+_PM10_AQI_LUT = _build_aqi_lut(_PM10_CONC, _PM10_AQI)   # 0.0–604.0 µg/m³
+
+
+def _lut_index(conc: float, lut: np.ndarray) -> int:
+    if conc <= 0:
         return 0
-    breakpoints = [
-        (0.0,   12.0,    0,  50),
-        (12.1,  35.4,   51, 100),
-        (35.5,  55.4,  101, 150),
-        (55.5, 150.4,  151, 200),
-        (150.5, 250.4, 201, 300),
-        (250.5, 350.4, 301, 400),
-        (350.5, 500.4, 401, 500),
-    ]
+    return min(int(conc * _LUT_SCALE + _LUT_EPS), len(lut) - 1)
+
 
-    for pm_lo, pm_hi, aqi_lo, aqi_hi in breakpoints:
-        if pm25 <= pm_hi:
-            aqi = ((aqi_hi - aqi_lo) / (pm_hi - pm_lo)) * (pm25 - pm_lo) + aqi_lo
-            return round(aqi)
+def _lut_index_vec(conc: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    idx = (np.maximum(conc, 0.0) * _LUT_SCALE + _LUT_EPS).astype(np.int64)
+    return np.minimum(idx, len(lut) - 1)
 
-    return 500
+
+def _compute_aqi_from_pm25(pm25: float) -> int:
+    """
+    Convert PM2.5 concentration (µg/m³) to US EPA AQI using standard breakpoints.
+    This gives a proper 0-500 AQI scale.
+    """
+    return int(_PM25_AQI_LUT[_lut_index(pm25, _PM25_AQI_LUT)])
 
 
 def _compute_aqi_from_pm10(pm10: float) -> int:
     """
     Convert PM10 concentration (µg/m³) to US EPA AQI using standard breakpoints.
     """
-    if pm10 < 0:
-        return 0
-    breakpoints = [
-        (0,    54,     0,  50),
-        (55,   154,   51, 100),
-        (155,  254,  101, 150),
-        (255,  354,  151, 200),
-        (355,  424,  201, 300),
-        (425,  504,  301, 400),
-        (505,  604,  401, 500),
-    ]
+    return int(_PM10_AQI_LUT[_lut_index(pm10, _PM10_AQI_LUT)])
+
+
+def _compute_aqi_from_pm25_vec(pm25: np.ndarray) -> np.ndarray:
+    """Vectorized _compute_aqi_from_pm25 for batch use (many locations at once)."""
+    return _PM25_AQI_LUT[_lut_index_vec(np.asarray(pm25, dtype=np.float64), _PM25_AQI_LUT)].astype(np.int64)
+
+
+def _compute_aqi_from_pm10_vec(pm10: np.ndarray) -> np.ndarray:
+    """Vectorized _compute_aqi_from_pm10 for batch use (many locations at once)."""
+    return _PM10_AQI_LUT[_lut_index_vec(np.asarray(pm10, dtype=np.float64), _PM10_AQI_LUT)].astype(np.int64)
 
-    for pm_lo, pm_hi, aqi_lo, aqi_hi in breakpoints:
-        if pm10 <= pm_hi:
-            aqi = ((aqi_hi - aqi_lo) / (pm_hi - pm_lo)) * (pm10 - pm_lo) + aqi_lo
-            return round(aqi)
 
-    return 500
+# ── AQI sub-index → concentration (inverse) segments ──
+# Per breakpoint row: (slope, aqi_lo, conc_lo), searched by aqi_hi with bisect.
+# Same arithmetic as the per-row formula, so results match it exactly.
+def _inverse_table(breakpoints) -> Tuple[tuple, tuple]:
+    his = tuple(aqi_hi for _, _, _, aqi_hi in breakpoints)
+    rows = tuple(
+        ((c_hi - c_lo) / (a_hi - a_lo), a_lo, c_lo)
+        for c_lo, c_hi, a_lo, a_hi in breakpoints
+    )
+    return his, rows
+
+
+_PM25_INV_HIS, _PM25_INV_ROWS = _inverse_table(_PM25_BREAKPOINTS)
+_PM10_INV_HIS, _PM10_INV_ROWS = _inverse_table(_PM10_BREAKPOINTS)
 
 
 def _aqi_to_pm25(aqi_subindex: float) -> float:
@@ -286,22 +500,11 @@ def _aqi_to_pm25(aqi_subindex: float) -> float:
     """
     if aqi_subindex <= 0:
         return 0.0
-    breakpoints = [
-        (0,  50,    0.0,   12.0),
-        (51, 100,  12.1,   35.4),
-        (101, 150, 35.5,   55.4),
-        (151, 200, 55.5,  150.4),
-        (201, 300, 150.5, 250.4),
-        (301, 400, 250.5, 350.4),
-        (401, 500, 350.5, 500.4),
-    ]
-
-    for aqi_lo, aqi_hi, pm_lo, pm_hi in breakpoints:
-        if aqi_subindex <= aqi_hi:
-            pm = ((pm_hi - pm_lo) / (aqi_hi - aqi_lo)) * (aqi_subindex - aqi_lo) + pm_lo
-            return round(pm, 1)
-
-    return 500.0
+    idx = bisect_left(_PM25_INV_HIS, aqi_subindex)
+    if idx == len(_PM25_INV_ROWS):
+        return 500.0
+    slope, aqi_lo, pm_lo = _PM25_INV_ROWS[idx]
+    return round(slope * (aqi_subindex - aqi_lo) + pm_lo, 1)
 
 
 def _aqi_to_pm10(aqi_subindex: float) -> float:
@@ -311,22 +514,11 @@ def _aqi_to_pm10(aqi_subindex: float) -> float:
     """
     if aqi_subindex <= 0:
         return 0.0
-    breakpoints = [
-        (0,  50,    0,   54),
-        (51, 100,  55,  154),
-        (101, 150, 155, 254),
-        (151, 200, 255, 354),
-        (201, 300, 355, 424),
-        (301, 400, 425, 504),
-        (401, 500, 505, 604),
-    ]
-
-    for aqi_lo, aqi_hi, pm_lo, pm_hi in breakpoints:
-        if aqi_subindex <= aqi_hi:
-            pm = ((pm_hi - pm_lo) / (aqi_hi - aqi_lo)) * (aqi_subindex - aqi_lo) + pm_lo
-            return round(pm, 1)
-
-    return 604.0
+    idx = bisect_left(_PM10_INV_HIS, aqi_subindex)
+    if idx == len(_PM10_INV_ROWS):
+        return 604.0
+    slope, aqi_lo, pm_lo = _PM10_INV_ROWS[idx]
+    return round(slope * (aqi_subindex - aqi_lo) + pm_lo, 1)
 
 
 def _get_demo_aqi(lat: float = 19.076, lon: float = 72.878) -> dict:
@@ -334,11 +526,8 @@ def _get_demo_aqi(lat: float = 19.076, lon: float = 72.878) -> dict:
     Location-aware demo AQI data. Uses coordinate hash to produce varied
     but deterministic values so each location feels unique.
     """
-    import hashlib
-
     # Create a deterministic seed from coordinates (rounded to ~1km)
-    coord_str = f"{lat:.3f},{lon:.3f}"
-    seed = int(hashlib.md5(coord_str.encode()).hexdigest()[:8], 16)
+    seed = _coord_seed(lat, lon)
 
     # Generate varied AQI in realistic Indian metro range (60-220)
     base_aqi = 60 + (seed % 161)  # 60 to 220
@@ -355,3 +544,20 @@ def _get_demo_aqi(lat: float = 19.076, lon: float = 72.878) -> dict:
         "o3": round(15 + (seed % 45), 1),
         "source": "demo",
     }
+
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _coord_seed(lat: float, lon: float) -> int:
+    """
+    Deterministic 32-bit seed from coordinates rounded to 3 decimals.
+    SplitMix64 finalizer over the two float bit patterns — a cheap,
+    well-mixed non-cryptographic hash.
+    """
+    lat_bits, lon_bits = struct.unpack("<QQ", struct.pack("<dd", round(lat, 3), round(lon, 3)))
+    h = (lat_bits * 0x9E3779B97F4A7C15 ^ lon_bits) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    h ^= h >> 31
+    return h & 0xFFFFFFFF
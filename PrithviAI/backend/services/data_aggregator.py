@@ -11,8 +11,33 @@ from services.air_quality_service import fetch_air_quality
 from services.uv_service import fetch_uv_index
 from services.sensor_service import sensor_manager
 from datetime import datetime
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union
 import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# ── Cached wall clock ──
+# A background tick refreshes this every 0.5s while the app is running, so the
+# per-request timestamp is a plain global read. Outside the app lifespan
+# (scripts, tests) the tick isn't running and utcnow() is used directly.
+_CLOCK_TICK_S = 0.5
+_now: Optional[datetime] = None
+
+
+async def run_clock() -> None:
+    """Keep _now fresh until cancelled (started from the app lifespan)."""
+    global _now
+    try:
+        while True:
+            _now = datetime.utcnow()
+            await asyncio.sleep(_CLOCK_TICK_S)
+    finally:
+        _now = None
+
+
+# Sensor fields copied verbatim onto EnvironmentData (temperature handled separately)
+_SENSOR_FIELDS = ("pm25", "pm10", "humidity", "noise_db", "water_level")
 
 
 async def get_aggregated_environment(
@@ -48,33 +73,71 @@ async def get_aggregated_environment_with_quality(
         - data_age_minutes: int
     """
 
-    api_errors: List[str] = []
-    missing_metrics: List[str] = []
-    is_cached = False
-
     # ── Fetch ALL external APIs in parallel for speed ──
-    weather_task = fetch_current_weather(lat, lon, city)
-    aqi_task = fetch_air_quality(lat, lon, city)
-    uv_task = fetch_uv_index(lat, lon)
-    
     weather_raw, aqi_data, uv_index = await asyncio.gather(
-        weather_task, aqi_task, uv_task,
+        fetch_current_weather(lat, lon, city),
+        fetch_air_quality(lat, lon, city),
+        fetch_uv_index(lat, lon),
         return_exceptions=True
     )
-    
+
+    return _build_environment(lat, lon, weather_raw, aqi_data, uv_index, sensor_data, precision)
+
+
+async def get_aggregated_environments(
+    points: List[Tuple[float, float, str]],
+) -> List[Union[EnvironmentData, Exception]]:
+    """
+    Batch variant of get_aggregated_environment for multi-location views.
+    All weather/AQI/UV fetches for every point go out in a single gather,
+    so N locations share one event-loop round instead of N.
+    A point whose environment can't be built gets the exception in its slot,
+    so one bad payload doesn't fail the others.
+    """
+    n = len(points)
+    results = await asyncio.gather(
+        *[fetch_current_weather(lat, lon, city) for lat, lon, city in points],
+        *[fetch_air_quality(lat, lon, city) for lat, lon, city in points],
+        *[fetch_uv_index(lat, lon) for lat, lon, _ in points],
+        return_exceptions=True
+    )
+
+    envs: List[Union[EnvironmentData, Exception]] = []
+    for i, (lat, lon, _) in enumerate(points):
+        try:
+            envs.append(_build_environment(lat, lon, results[i], results[n + i], results[2 * n + i])[0])
+        except Exception as e:
+            envs.append(e)
+    return envs
+
+
+def _build_environment(
+    lat: float,
+    lon: float,
+    weather_raw,
+    aqi_data,
+    uv_index,
+    sensor_data: Optional[SensorData] = None,
+    precision: str = "city-level",
+) -> Tuple[EnvironmentData, dict]:
+    """Merge raw fetch results (or their exceptions) into EnvironmentData + data quality."""
+    api_errors: List[str] = []
+    missing_metrics: List[str] = []
+    is_cached = False
+
     # Handle exceptions gracefully, track failures for confidence
     if isinstance(weather_raw, Exception):
-        print(f"[Aggregator] Weather fetch failed: {weather_raw}")
+        logger.warning("[Aggregator] Weather fetch failed: %s", weather_raw)
         weather_raw = {"main": {}, "wind": {}, "weather": [{}], "visibility": 10000}
         api_errors.append("weather")
         missing_metrics.extend(["temperature", "humidity", "wind"])
     if isinstance(aqi_data, Exception):
-        print(f"[Aggregator] AQI fetch failed: {aqi_data}")
+        logger.warning("[Aggregator] AQI fetch failed: %s", aqi_data)
         aqi_data = {"aqi": 0, "pm25": 0, "pm10": 0}
         api_errors.append("air_quality")
         missing_metrics.extend(["aqi", "pm25"])
     if isinstance(uv_index, Exception):
-        print(f"[Aggregator] UV fetch failed: {uv_index}")
+        logger.warning("[Aggregator] UV fetch failed: %s", uv_index)
         uv_index = 0.0
         api_errors.append("uv")
         missing_metrics.append("uv_index")
@@ -94,27 +157,22 @@ async def get_aggregated_environment_with_quality(
     if sensor_data:
         smoothed = sensor_manager.ingest(sensor_data)
         
-        if smoothed.pm25 is not None:
-            env.pm25 = smoothed.pm25
-        if smoothed.pm10 is not None:
-            env.pm10 = smoothed.pm10
+        # Temperature first: shift feels_like by the sensor-vs-API difference
         if smoothed.temperature is not None:
-            env.temperature = smoothed.temperature
             temp_diff = smoothed.temperature - env.temperature
+            env.temperature = smoothed.temperature
             env.feels_like += temp_diff
-        if smoothed.humidity is not None:
-            env.humidity = smoothed.humidity
-        if smoothed.noise_db is not None:
-            env.noise_db = smoothed.noise_db
-        if smoothed.water_level is not None:
-            env.water_level = smoothed.water_level
+        for field in _SENSOR_FIELDS:
+            value = getattr(smoothed, field)
+            if value is not None:
+                setattr(env, field, value)
     else:
         # Use time + location noise model (no free real-time noise API exists globally)
         demo = sensor_manager.get_demo_sensor_data(lat, lon)
         if env.noise_db == 0:
             env.noise_db = demo.noise_db
     
-    env.timestamp = datetime.utcnow()
+    env.timestamp = _now or datetime.utcnow()
 
     # ── Build data quality context for confidence calculation ──
     data_quality = {
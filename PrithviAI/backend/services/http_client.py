@@ -0,0 +1,50 @@
+"""
+PrithviAI — Shared HTTP Clients
+One pooled HTTP/2 client per upstream service, so keep-alive connections (and
+their TLS sessions) are reused across requests instead of rebuilt per call.
+"""
+
+from typing import Dict, Union
+import httpx
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_client(
+    name: str,
+    *,
+    timeout: Union[float, httpx.Timeout] = 10.0,
+    max_connections: int = 50,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 5.0,
+    retries: int = 0,
+    trust_env: bool = True,
+) -> httpx.AsyncClient:
+    """
+    Return the named service's client, creating it on first use.
+    Options only apply at creation; later calls return the existing client.
+    """
+    client = _clients.get(name)
+    if client is None:
+        client = _clients[name] = httpx.AsyncClient(
+            trust_env=trust_env,
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=retries,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            ),
+        )
+    return client
+
+
+async def close_all() -> None:
+    """Close every shared client (called on app shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -4,10 +4,141 @@ Handles incoming data from hardware sensors.
 Provides data cleaning, validation, and temporal smoothing.
 """
 
-from typing import Optional, List, Dict
-from datetime import datetime, timedelta
-from collections import deque
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from models.schemas import SensorData
+import logging
+import math
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Sensor fields smoothed by SensorDataManager (column order of its buffer)
+_FIELDS = ("pm25", "pm10", "temperature", "humidity", "noise_db", "water_level")
+
+# ── Demo noise model tables ──
+# Stored as (N, 4) arrays — columns: lat, lon, radius_deg, offset_dB — so the
+# per-call distance check is one vectorised pass instead of a Python loop.
+# Radii are in latitude degrees; longitude deltas are scaled by cos(lat).
+
+# City-level noise adjustment (metros are louder).
+# Based on published CPCB noise data for Indian cities
+_CITY_NOISE_OFFSETS = np.array([
+    # (lat_center, lon_center, radius_deg, base_offset_dB)
+    # Delhi NCR — one of the noisiest cities in India
+    (28.61, 77.21, 0.3, +8),
+    # Mumbai — high density
+    (19.08, 72.88, 0.25, +6),
+    # Kolkata — dense with traffic
+    (22.57, 88.36, 0.2, +5),
+    # Chennai
+    (13.08, 80.27, 0.2, +3),
+    # Bangalore
+    (12.97, 77.59, 0.2, +2),
+    # Hyderabad
+    (17.39, 78.49, 0.2, +2),
+    # Pune — moderate
+    (18.52, 73.86, 0.2, +0),
+], dtype=np.float64)
+
+# Known zone-level adjustments (traffic hubs, quiet parks, etc.)
+_NOISE_ZONES = np.array([
+    # Pune zones
+    (18.531, 73.848, 0.015, +12),   # Shivajinagar junction
+    (18.509, 73.926, 0.015, +10),   # Hadapsar traffic
+    (18.591, 73.739, 0.012, +8),    # Hinjewadi IT traffic
+    (18.530, 73.879, 0.012, +9),    # Pune Station area
+    (18.458, 73.804, 0.025, -12),   # Sinhagad foothills
+    (18.554, 73.808, 0.015, -8),    # Pashan lake
+    (18.537, 73.894, 0.012, -5),    # Koregaon Park
+    (18.527, 73.953, 0.020, +8),    # Pimpri-Chinchwad industrial
+    (18.633, 73.795, 0.015, +6),    # Bhosari MIDC
+    # Delhi zones
+    (28.633, 77.220, 0.015, +10),   # Chandni Chowk
+    (28.570, 77.250, 0.012, +8),    # ITO junction
+    (28.556, 77.100, 0.015, -6),    # Ridge forest
+    (28.613, 77.229, 0.012, +12),   # Connaught Place
+    (28.653, 77.234, 0.012, +7),    # Old Delhi railway
+    # Mumbai zones
+    (19.017, 72.831, 0.012, +10),   # Dadar station area
+    (19.067, 72.835, 0.010, +9),    # Bandra traffic
+    (18.922, 72.835, 0.012, +11),   # CST/Fort area
+    (19.126, 72.908, 0.020, -5),    # Sanjay Gandhi National Park
+    # Bangalore zones
+    (12.977, 77.572, 0.012, +8),    # Majestic bus station
+    (12.935, 77.610, 0.012, +6),    # Silk Board junction
+    (13.020, 77.570, 0.015, -4),    # Lalbagh
+    # Kolkata zones
+    (22.572, 88.363, 0.012, +10),   # Howrah bridge area
+    (22.550, 88.340, 0.015, +8),    # Esplanade
+    # Chennai zones
+    (13.082, 80.282, 0.012, +7),    # T Nagar
+    (13.107, 80.290, 0.015, +9),    # Central station
+], dtype=np.float64)
+
+
+def _table_columns(table: np.ndarray) -> tuple:
+    """Split a (lat, lon, radius, offset) table into (lat, lon, radius², 1/radius, offset)."""
+    lat, lon, rad, offset = table.T
+    return lat, lon, rad * rad, 1.0 / rad, offset
+
+
+# ── Coarse spatial grid over the tables ──
+# Each row is registered in every grid cell its radius can reach, so a query
+# only scans the rows bucketed under its own cell (usually 0-3) instead of all.
+_ZONE_CELL_DEG = 0.1
+_CITY_CELL_DEG = 0.5
+
+
+def _grid_cell(lat: float, lon: float, cell_deg: float) -> Tuple[int, int]:
+    return math.floor(lat / cell_deg), math.floor(lon / cell_deg)
+
+
+def _build_grid(table: np.ndarray, cell_deg: float) -> Dict[Tuple[int, int], tuple]:
+    """Map grid cell → column tuple (see _table_columns) of the rows that may cover it."""
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for idx, (lat, lon, rad, _) in enumerate(table.tolist()):
+        # Longitude reach widens by 1/cos(lat); use the row's poleward edge to stay conservative
+        lon_rad = rad / math.cos(math.radians(min(abs(lat) + rad, 89.0)))
+        lat_lo, lon_lo = _grid_cell(lat - rad, lon - lon_rad, cell_deg)
+        lat_hi, lon_hi = _grid_cell(lat + rad, lon + lon_rad, cell_deg)
+        for i in range(lat_lo, lat_hi + 1):
+            for j in range(lon_lo, lon_hi + 1):
+                cells.setdefault((i, j), []).append(idx)
+    return {cell: _table_columns(table[rows]) for cell, rows in cells.items()}
+
+
+_CITY_NOISE_GRID = _build_grid(_CITY_NOISE_OFFSETS, _CITY_CELL_DEG)
+_NOISE_ZONE_GRID = _build_grid(_NOISE_ZONES, _ZONE_CELL_DEG)
+
+# ── Time-of-day base noise (dB) — urban Indian city pattern, indexed by IST hour ──
+_TIME_BASE_BY_HOUR = (
+    35.0, 35.0, 35.0, 35.0, 35.0,   # 00-04  Late night — quiet
+    45.0, 45.0,                     # 05-06  Early morning — waking up
+    62.0, 62.0, 62.0,               # 07-09  Morning rush hour
+    55.0, 55.0, 55.0,               # 10-12  Late morning
+    52.0, 52.0, 52.0,               # 13-15  Afternoon
+    65.0, 65.0, 65.0, 65.0,         # 16-19  Evening rush hour
+    50.0, 50.0,                     # 20-21  Post dinner
+    42.0, 42.0,                     # 22-23  Night
+)
+
+_IST_OFFSET = timedelta(hours=5, minutes=30)
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _coord_hash(lat: float, lon: float) -> int:
+    """
+    Deterministic 64-bit hash of coordinates at 4-decimal precision.
+    SplitMix64-style integer mix — no string formatting or MD5 needed.
+    """
+    k = (round(lat * 10000) * 0x9E3779B97F4A7C15) ^ (round(lon * 10000) * 0xBF58476D1CE4E5B9)
+    k &= _MASK64
+    k = ((k ^ (k >> 30)) * 0x94D049BB133111EB) & _MASK64
+    return k ^ (k >> 31)
 
 
 class SensorDataManager:
@@ -20,16 +151,15 @@ class SensorDataManager:
     
     def __init__(self, window_size: int = 5):
         self.window_size = window_size
-        # Rolling windows for each sensor type
-        self._buffers: Dict[str, deque] = {
-            "pm25": deque(maxlen=window_size),
-            "pm10": deque(maxlen=window_size),
-            "temperature": deque(maxlen=window_size),
-            "humidity": deque(maxlen=window_size),
-            "noise_db": deque(maxlen=window_size),
-            "water_level": deque(maxlen=window_size),
-        }
-        self._last_valid: Dict[str, float] = {}
+        # Rolling windows for all sensor types in one (window, field) matrix.
+        # Each column is an independent ring buffer with its own head/count, and
+        # a running sum per column keeps every mean O(1).
+        # Readings are stored as float32 (sensor precision is far below 7 digits);
+        # the running sums stay float64 so add/evict round-trips don't drift.
+        self._buf = np.zeros((window_size, len(_FIELDS)), dtype=np.float32)
+        self._heads = np.zeros(len(_FIELDS), dtype=np.int64)
+        self._counts = np.zeros(len(_FIELDS), dtype=np.int64)
+        self._sums = np.zeros(len(_FIELDS), dtype=np.float64)
     
     # ── Valid sensor ranges (physical limits + sanity) ──
     VALID_RANGES = {
@@ -41,6 +171,9 @@ class SensorDataManager:
         "water_level": (0, 500),  # cm
         "soil_moisture": (0, 100), # %
     }
+    # Float bounds resolved once; unknown sensors only reject negatives
+    _BOUNDS = {k: (float(lo), float(hi)) for k, (lo, hi) in VALID_RANGES.items()}
+    _DEFAULT_BOUNDS = (0.0, math.inf)
     
     def validate_reading(self, sensor: str, value: Optional[float]) -> Optional[float]:
         """
@@ -50,14 +183,33 @@ class SensorDataManager:
         if value is None:
             return None
         
-        low, high = self.VALID_RANGES.get(sensor, (0, float('inf')))
+        low, high = self._BOUNDS.get(sensor, self._DEFAULT_BOUNDS)
         
         if not (low <= value <= high):
-            print(f"[Sensor] Invalid {sensor} reading: {value} (range: {low}-{high})")
+            logger.warning("[Sensor] Invalid %s reading: %s (range: %s-%s)", sensor, value, low, high)
             return None
         
         return value
     
+    def _push(self, cols: np.ndarray, values: np.ndarray) -> None:
+        """Write one value into each given column's ring buffer, updating running sums."""
+        rows = self._heads[cols]
+        stored = values.astype(np.float32)
+        # Slots start at 0, so subtracting the overwritten value is a no-op until a column fills
+        self._sums[cols] += stored.astype(np.float64) - self._buf[rows, cols].astype(np.float64)
+        self._buf[rows, cols] = stored
+        self._heads[cols] = (rows + 1) % self.window_size
+        self._counts[cols] = np.minimum(self._counts[cols] + 1, self.window_size)
+    
+    def _smoothed(self) -> SensorData:
+        """Current per-field window means (fields with no readings stay None)."""
+        means = (self._sums / np.maximum(self._counts, 1)).tolist()
+        return SensorData(**{
+            field: round(mean, 2)
+            for field, count, mean in zip(_FIELDS, self._counts.tolist(), means)
+            if count
+        })
+    
     def ingest(self, reading: SensorData) -> SensorData:
         """
         Process a new sensor reading:
@@ -65,38 +217,56 @@ class SensorDataManager:
         2. Add to rolling buffer
         3. Return smoothed (averaged) values
         """
-        validated = SensorData()
-        
-        for field in ["pm25", "pm10", "temperature", "humidity", "noise_db", "water_level"]:
-            raw_value = getattr(reading, field, None)
-            valid_value = self.validate_reading(field, raw_value)
-            
+        cols, values = [], []
+        validate = self.validate_reading
+        raw = reading.__dict__   # one dict read per field instead of getattr dispatch
+        for col, field in enumerate(_FIELDS):
+            valid_value = validate(field, raw.get(field))
             if valid_value is not None:
-                self._buffers[field].append(valid_value)
-                self._last_valid[field] = valid_value
-            
-            # Compute smoothed value from buffer
-            if self._buffers[field]:
-                smoothed = sum(self._buffers[field]) / len(self._buffers[field])
-                setattr(validated, field, round(smoothed, 2))
-            elif field in self._last_valid:
-                # Use last known good value
-                setattr(validated, field, self._last_valid[field])
+                cols.append(col)
+                values.append(valid_value)
         
-        return validated
-    
+        if cols:
+            self._push(np.array(cols), np.array(values, dtype=np.float64))
+        
+        return self._smoothed()
+
+    def ingest_many(
+        self,
+        readings: np.ndarray,
+        cols: Tuple[str, ...] = ("pm25", "temperature"),
+    ) -> SensorData:
+        """
+        Ingest an (N, len(cols)) batch of readings (oldest row first) in one pass.
+        Equivalent to N calls to ingest(); NaN or out-of-range cells are skipped.
+        """
+        batch = np.asarray(readings, dtype=np.float64).reshape(-1, len(cols))
+        window = self.window_size
+        for field, values in zip(cols, batch.T):
+            col = _FIELDS.index(field)
+            low, high = self._BOUNDS.get(field, self._DEFAULT_BOUNDS)
+            ok = (values >= low) & (values <= high)   # NaN fails both comparisons
+            if not ok.all():
+                logger.warning("[Sensor] Dropped %d invalid %s readings (range: %s-%s)",
+                               int((~ok).sum()), field, low, high)
+            values = values[ok]
+            n = len(values)
+            if not n:
+                continue
+            # Only the last `window` values survive; write them where sequential pushes would land
+            head = int(self._heads[col])
+            kept = values[-window:]
+            rows = (head + np.arange(n - len(kept), n)) % window
+            self._buf[rows, col] = kept.astype(np.float32)
+            self._heads[col] = (head + n) % window
+            self._counts[col] = min(int(self._counts[col]) + n, window)
+            self._sums[col] = self._buf[:, col].astype(np.float64).sum()
+
+        return self._smoothed()
+
     def get_latest_smoothed(self) -> SensorData:
         """Get the latest smoothed sensor data."""
-        result = SensorData()
-        
-        for field in ["pm25", "pm10", "temperature", "humidity", "noise_db", "water_level"]:
-            if self._buffers[field]:
-                smoothed = sum(self._buffers[field]) / len(self._buffers[field])
-                setattr(result, field, round(smoothed, 2))
-            elif field in self._last_valid:
-                setattr(result, field, self._last_valid[field])
-        
-        return result
+        return self._smoothed()
     
     def get_demo_sensor_data(self, lat: float = 18.5204, lon: float = 73.8567) -> SensorData:
         """
@@ -104,112 +274,71 @@ class SensorDataManager:
         Uses time-of-day urban patterns + city-specific zones + population density proxy.
         Works for ANY Indian city, with special accuracy for known zones.
         """
-        from datetime import datetime, timezone, timedelta
-        import hashlib, math
-
-        # IST time (UTC + 5:30)
-        ist = datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)
-        hour = ist.hour
-
-        # ── Time-of-day base noise (dB) — urban Indian city pattern ──
-        if 0 <= hour < 5:
-            time_base = 35.0   # Late night — quiet
-        elif 5 <= hour < 7:
-            time_base = 45.0   # Early morning — waking up
-        elif 7 <= hour < 10:
-            time_base = 62.0   # Morning rush hour
-        elif 10 <= hour < 13:
-            time_base = 55.0   # Late morning
-        elif 13 <= hour < 16:
-            time_base = 52.0   # Afternoon
-        elif 16 <= hour < 20:
-            time_base = 65.0   # Evening rush hour
-        elif 20 <= hour < 22:
-            time_base = 50.0   # Post dinner
-        else:
-            time_base = 42.0   # Night
-
-        # ── City-level noise adjustment (metros are louder) ──
-        # Based on published CPCB noise data for Indian cities
-        CITY_NOISE_OFFSETS = {
-            # (lat_center, lon_center, radius_deg, base_offset_dB)
-            # Delhi NCR — one of the noisiest cities in India
-            (28.61, 77.21, 0.3, +8),
-            # Mumbai — high density
-            (19.08, 72.88, 0.25, +6),
-            # Kolkata — dense with traffic
-            (22.57, 88.36, 0.2, +5),
-            # Chennai
-            (13.08, 80.27, 0.2, +3),
-            # Bangalore
-            (12.97, 77.59, 0.2, +2),
-            # Hyderabad
-            (17.39, 78.49, 0.2, +2),
-            # Pune — moderate
-            (18.52, 73.86, 0.2, +0),
-        }
-
-        city_adj = 0.0
-        for c_lat, c_lon, c_rad, c_offset in CITY_NOISE_OFFSETS:
-            dist = math.sqrt((lat - c_lat) ** 2 + (lon - c_lon) ** 2)
-            if dist < c_rad:
-                influence = 1.0 - (dist / c_rad)
-                city_adj = max(city_adj, c_offset * influence)
-
-        # ── Known zone-level adjustments (traffic hubs, quiet parks, etc.) ──
-        # Applies only when user zooms into known locations
-        NOISE_ZONES = [
-            # Pune zones
-            (18.531, 73.848, 0.015, +12),   # Shivajinagar junction
-            (18.509, 73.926, 0.015, +10),   # Hadapsar traffic
-            (18.591, 73.739, 0.012, +8),    # Hinjewadi IT traffic
-            (18.530, 73.879, 0.012, +9),    # Pune Station area
-            (18.458, 73.804, 0.025, -12),   # Sinhagad foothills
-            (18.554, 73.808, 0.015, -8),    # Pashan lake
-            (18.537, 73.894, 0.012, -5),    # Koregaon Park
-            (18.527, 73.953, 0.020, +8),    # Pimpri-Chinchwad industrial
-            (18.633, 73.795, 0.015, +6),    # Bhosari MIDC
-            # Delhi zones
-            (28.633, 77.220, 0.015, +10),   # Chandni Chowk
-            (28.570, 77.250, 0.012, +8),    # ITO junction
-            (28.556, 77.100, 0.015, -6),    # Ridge forest
-            (28.613, 77.229, 0.012, +12),   # Connaught Place
-            (28.653, 77.234, 0.012, +7),    # Old Delhi railway
-            # Mumbai zones
-            (19.017, 72.831, 0.012, +10),   # Dadar station area
-            (19.067, 72.835, 0.010, +9),    # Bandra traffic
-            (18.922, 72.835, 0.012, +11),   # CST/Fort area
-            (19.126, 72.908, 0.020, -5),    # Sanjay Gandhi National Park
-            # Bangalore zones
-            (12.977, 77.572, 0.012, +8),    # Majestic bus station
-            (12.935, 77.610, 0.012, +6),    # Silk Board junction
-            (13.020, 77.570, 0.015, -4),    # Lalbagh
-            # Kolkata zones
-            (22.572, 88.363, 0.012, +10),   # Howrah bridge area
-            (22.550, 88.340, 0.015, +8),    # Esplanade
-            # Chennai zones
-            (13.082, 80.282, 0.012, +7),    # T Nagar
-            (13.107, 80.290, 0.015, +9),    # Central station
-        ]
-
-        zone_adj = 0.0
-        for z_lat, z_lon, z_rad, z_noise in NOISE_ZONES:
-            dist = math.sqrt((lat - z_lat) ** 2 + (lon - z_lon) ** 2)
-            if dist < z_rad:
-                influence = 1.0 - (dist / z_rad)
-                zone_adj += z_noise * influence
-
-        # Small deterministic variance from coordinates (±3 dB)
-        coord_hash = int(hashlib.md5(f"{lat:.4f},{lon:.4f}".encode()).hexdigest()[:4], 16)
-        micro_noise = ((coord_hash % 60) - 30) / 10.0  # -3 to +3 dB
-
-        noise_db = round(max(25.0, min(95.0, time_base + city_adj + zone_adj + micro_noise)), 1)
-
+        # SensorData is built fresh each call so the cached value is never shared/mutated
         return SensorData(
-            noise_db=noise_db,
+            noise_db=_demo_noise_db(round(lat, 3), round(lon, 3), _ist_hour()),
             water_level=0,
         )
 
 
+# Current IST hour and the monotonic time it stays valid until
+_HOUR_CACHE = [0, 0.0]
+_HOUR_REFRESH_MAX_S = 60.0   # re-read the wall clock at least once a minute
+
+
+def _ist_hour() -> int:
+    """
+    Current hour in IST (UTC + 5:30). The wall clock is only read again when
+    the cached hour may have rolled over, otherwise this is a float compare.
+    """
+    now = time.monotonic()
+    if now >= _HOUR_CACHE[1]:
+        ist = datetime.now(timezone.utc) + _IST_OFFSET
+        to_next_hour = 3600 - (ist.minute * 60 + ist.second + ist.microsecond / 1e6)
+        _HOUR_CACHE[0] = ist.hour
+        _HOUR_CACHE[1] = now + min(to_next_hour, _HOUR_REFRESH_MAX_S)
+    return _HOUR_CACHE[0]
+
+
+@lru_cache(maxsize=4096)
+def _demo_noise_db(lat: float, lon: float, hour: int) -> float:
+    """
+    Pure demo noise model (dB) for a ~100 m tile and IST hour.
+    Deterministic in its inputs, so repeated polling of the same tile is a cache hit.
+    """
+    time_base = _TIME_BASE_BY_HOUR[hour]
+
+    # ── City-level noise adjustment (metros are louder) ──
+    # Equirectangular distance: scale Δlon by cos(lat) once so degree radii
+    # are metrically consistent, and compare squared distances so sqrt only
+    # runs for the (usually 0-2) rows that actually fall inside a radius.
+    cos_lat = math.cos(math.radians(lat))
+
+    city_adj = 0.0
+    city_rows = _CITY_NOISE_GRID.get(_grid_cell(lat, lon, _CITY_CELL_DEG))
+    if city_rows is not None:
+        c_lat, c_lon, c_rad2, c_inv_rad, c_offset = city_rows
+        d2 = (lat - c_lat) ** 2 + ((lon - c_lon) * cos_lat) ** 2
+        inside = d2 < c_rad2
+        if inside.any():
+            influence = 1.0 - np.sqrt(d2[inside]) * c_inv_rad[inside]
+            city_adj = max(city_adj, float((c_offset[inside] * influence).max()))
+
+    # ── Known zone-level adjustments (applies when zoomed into known locations) ──
+    zone_adj = 0.0
+    zone_rows = _NOISE_ZONE_GRID.get(_grid_cell(lat, lon, _ZONE_CELL_DEG))
+    if zone_rows is not None:
+        z_lat, z_lon, z_rad2, z_inv_rad, z_noise = zone_rows
+        d2 = (lat - z_lat) ** 2 + ((lon - z_lon) * cos_lat) ** 2
+        inside = d2 < z_rad2
+        zone_adj = float((z_noise[inside] * (1.0 - np.sqrt(d2[inside]) * z_inv_rad[inside])).sum())
+
+    # Small deterministic variance from coordinates (±3 dB)
+    coord_hash = _coord_hash(lat, lon)
+    micro_noise = ((coord_hash % 60) - 30) / 10.0  # -3 to +3 dB
+
+    return round(max(25.0, min(95.0, time_base + city_adj + zone_adj + micro_noise)), 1)
+
+
 # Singleton instance
 sensor_manager = SensorDataManager()
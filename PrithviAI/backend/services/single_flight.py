@@ -0,0 +1,76 @@
+"""
+PrithviAI — Single-Flight Fetch Coalescing
+Concurrent cache misses for the same key share one upstream call instead of
+each hitting the API.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    In-flight fetches per key. Callers that find a matching fetch await its
+    result; if that fetch's own request is cancelled, waiters retry rather than
+    inheriting the cancellation.
+    """
+
+    def __init__(self):
+        # key -> (meta, future); meta lets callers decide whether a fetch is joinable
+        self._inflight: Dict[Hashable, Tuple[Any, asyncio.Future]] = {}
+
+    def lookup(
+        self,
+        keys: Iterable[Hashable],
+        accept: Optional[Callable[[Any], bool]] = None,
+    ) -> Optional[asyncio.Future]:
+        """First in-flight future among keys whose meta passes accept()."""
+        for key in keys:
+            entry = self._inflight.get(key)
+            if entry is not None and (accept is None or accept(entry[0])):
+                return entry[1]
+        return None
+
+    async def run(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable],
+        *,
+        meta: Any = None,
+        probe: Optional[Callable[[], Optional[asyncio.Future]]] = None,
+    ):
+        """
+        Run fetch() under key, or join a matching in-flight fetch.
+        probe finds a joinable fetch (default: the same key).
+        """
+        if probe is None:
+            probe = lambda: self.lookup((key,))
+
+        while (pending := probe()) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only retry when the leading request was cancelled, not this one
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        if key in self._inflight:
+            # The key is busy with a fetch probe() chose not to join
+            return await fetch()
+
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (meta, pending)
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            pending.exception()  # Mark retrieved — no waiters is not an error
+            raise
+        else:
+            pending.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
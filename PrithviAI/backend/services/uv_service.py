@@ -4,15 +4,21 @@ Fetches accurate UV index from Open-Meteo API (FREE, no key required, unlimited)
 Falls back to solar-zenith estimation if API is unavailable.
 """
 
-import httpx
+import orjson
 import math
+from typing import Dict, Tuple
 from datetime import datetime, timezone, timedelta
 from cachetools import TTLCache
 from config import settings
+from services import http_client
+from services.single_flight import SingleFlight
 
 # Cache UV data for 20 minutes
 _uv_cache = TTLCache(maxsize=200, ttl=1200)
 
+# Concurrent misses per cache key share one upstream call
+_flights = SingleFlight()
+
 
 async def fetch_uv_index(
     lat: float = None,
@@ -29,6 +35,10 @@ async def fetch_uv_index(
     if cache_key in _uv_cache:
         return _uv_cache[cache_key]
 
+    return await _flights.run(cache_key, lambda: _fetch_uv_uncached(lat, lon, cache_key))
+
+
+async def _fetch_uv_uncached(lat: float, lon: float, cache_key: str) -> float:
     # Primary: Open-Meteo API (free, no key, accurate satellite-derived UV)
     uv = await _fetch_from_open_meteo(lat, lon)
     if uv is not None:
@@ -55,22 +65,34 @@ async def _fetch_from_open_meteo(lat: float, lon: float) -> float:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            uv = data.get("current", {}).get("uv_index", None)
-            if uv is not None:
-                uv = round(float(uv), 1)
-                print(f"[UV] Open-Meteo: UV={uv} for ({lat:.2f}, {lon:.2f})")
-                return uv
+        response = await http_client.get_client("uv").get(url, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        uv = data.get("current", {}).get("uv_index", None)
+        if uv is not None:
+            uv = round(float(uv), 1)
+            print(f"[UV] Open-Meteo: UV={uv} for ({lat:.2f}, {lon:.2f})")
+            return uv
     except Exception as e:
         print(f"[UV] Open-Meteo API error: {e}")
 
     return None
 
 
+_DEG2RAD = math.pi / 180.0
+_DEC_CACHE: Dict[int, Tuple[float, float]] = {}
+
+
+def _declination_sincos(day_of_year: int) -> Tuple[float, float]:
+    """(sin, cos) of the solar declination for a day of the year, cached per day."""
+    cached = _DEC_CACHE.get(day_of_year)
+    if cached is None:
+        dec_rad = 23.45 * math.sin(360 / 365 * (day_of_year - 81) * _DEG2RAD) * _DEG2RAD
+        cached = _DEC_CACHE[day_of_year] = (math.sin(dec_rad), math.cos(dec_rad))
+    return cached
+
+
 def _estimate_uv_from_position(lat: float, lon: float) -> float:
     """
     Estimate UV index from solar zenith angle for the given location.
@@ -82,17 +104,13 @@ def _estimate_uv_from_position(lat: float, lon: float) -> float:
     local_solar = now + timedelta(hours=solar_offset)
     hour_angle = (local_solar.hour + local_solar.minute / 60.0 - 12.0) * 15.0
 
-    # Day of year for declination
-    day_of_year = now.timetuple().tm_yday
-    declination = 23.45 * math.sin(math.radians(360 / 365 * (day_of_year - 81)))
+    # Declination only changes per day — sin/cos come from a small cache
+    sin_dec, cos_dec = _declination_sincos(now.timetuple().tm_yday)
 
     # Solar zenith angle
-    lat_rad = math.radians(lat)
-    dec_rad = math.radians(declination)
-    ha_rad = math.radians(hour_angle)
-
-    cos_zenith = (math.sin(lat_rad) * math.sin(dec_rad) +
-                  math.cos(lat_rad) * math.cos(dec_rad) * math.cos(ha_rad))
+    lat_rad = lat * _DEG2RAD
+    cos_zenith = (math.sin(lat_rad) * sin_dec +
+                  math.cos(lat_rad) * cos_dec * math.cos(hour_angle * _DEG2RAD))
 
     if cos_zenith <= 0:
         return 0.0  # Sun below horizon
@@ -4,16 +4,22 @@ Fetches weather data from OpenWeatherMap API.
 Provides current conditions and 48-hour forecast.
 """
 
-import httpx
+import orjson
+import numpy as np
 from typing import List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from cachetools import TTLCache
 from config import settings
+from services import http_client
+from services.single_flight import SingleFlight
 from models.schemas import EnvironmentData
 
 # Cache weather data for 10 minutes to avoid API rate limits
 _weather_cache = TTLCache(maxsize=100, ttl=600)
 
+# Concurrent misses per cache key share one upstream call
+_flights = SingleFlight()
+
 
 async def fetch_current_weather(
     lat: float = None,
@@ -34,6 +40,10 @@ async def fetch_current_weather(
     if not settings.OPENWEATHER_API_KEY:
         return _get_demo_weather(lat, lon)
     
+    return await _flights.run(cache_key, lambda: _fetch_current_uncached(lat, lon, cache_key))
+
+
+async def _fetch_current_uncached(lat: float, lon: float, cache_key: str) -> dict:
     url = "https://api.openweathermap.org/data/2.5/weather"
     params = {
         "lat": lat,
@@ -43,12 +53,11 @@ async def fetch_current_weather(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            _weather_cache[cache_key] = data
-            return data
+        response = await http_client.get_client("weather").get(url, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        _weather_cache[cache_key] = data
+        return data
     except Exception as e:
         print(f"[Weather] API error: {e}. Using demo data.")
         return _get_demo_weather(lat, lon)
@@ -72,6 +81,10 @@ async def fetch_weather_forecast(
     if not settings.OPENWEATHER_API_KEY:
         return _get_demo_forecast(lat, lon)
     
+    return await _flights.run(cache_key, lambda: _fetch_forecast_uncached(lat, lon, cache_key))
+
+
+async def _fetch_forecast_uncached(lat: float, lon: float, cache_key: str) -> List[dict]:
     url = "https://api.openweathermap.org/data/2.5/forecast"
     params = {
         "lat": lat,
@@ -82,13 +95,12 @@ async def fetch_weather_forecast(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            forecasts = data.get("list", [])
-            _weather_cache[cache_key] = forecasts
-            return forecasts
+        response = await http_client.get_client("weather").get(url, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        forecasts = data.get("list", [])
+        _weather_cache[cache_key] = forecasts
+        return forecasts
     except Exception as e:
         print(f"[Weather] Forecast API error: {e}. Using demo data.")
         return _get_demo_forecast(lat, lon)
@@ -114,29 +126,29 @@ def parse_weather_to_env(weather_data: dict) -> EnvironmentData:
     )
 
 
+# Naive-UTC epoch: forecast "dt" values become naive UTC datetimes, matching
+# the utcnow() timestamps used everywhere else, with no tz lookup per item
+_EPOCH = datetime(1970, 1, 1)
+
+
 def parse_forecast_to_env_list(forecast_list: List[dict]) -> List[EnvironmentData]:
     """Convert forecast API response to list of EnvironmentData."""
-    result = []
-    for item in forecast_list:
-        main = item.get("main", {})
-        wind = item.get("wind", {})
-        rain = item.get("rain", {})
-        weather_list = item.get("weather", [{}])
-        
-        timestamp = datetime.fromtimestamp(item.get("dt", 0)) if "dt" in item else datetime.utcnow()
-        
-        env = EnvironmentData(
-            temperature=main.get("temp", 0),
+    # Bind lookups once; the walrus names share each item's sub-dicts across fields
+    utcnow = datetime.utcnow
+    empty = {}
+
+    return [
+        EnvironmentData(
+            temperature=(main := item.get("main", empty)).get("temp", 0),
             feels_like=main.get("feels_like", 0),
             humidity=main.get("humidity", 0),
-            wind_speed=wind.get("speed", 0),
-            rainfall=rain.get("3h", 0) if rain else 0,
-            weather_desc=weather_list[0].get("description", "") if weather_list else "",
-            timestamp=timestamp,
+            wind_speed=item.get("wind", empty).get("speed", 0),
+            rainfall=rain.get("3h", 0) if (rain := item.get("rain")) else 0,
+            weather_desc=weather[0].get("description", "") if (weather := item.get("weather")) else "",
+            timestamp=_EPOCH + timedelta(seconds=item["dt"]) if "dt" in item else utcnow(),
         )
-        result.append(env)
-    
-    return result
+        for item in forecast_list
+    ]
 
 
 # ── Demo Data (when API keys not configured) ──
@@ -159,26 +171,34 @@ def _get_demo_weather(lat: float, lon: float) -> dict:
 
 def _get_demo_forecast(lat: float, lon: float) -> List[dict]:
     """Generate 48 hours of demo forecast data."""
-    forecasts = []
     base_time = datetime.utcnow()
-    
-    for i in range(16):
-        hour = (base_time + timedelta(hours=i * 3)).hour
-        
-        # Simulate temperature curve (peak at 2 PM, low at 4 AM)
-        temp_base = 28 + 7 * max(0, 1 - abs(hour - 14) / 10)
-        humidity_base = 65 + 15 * max(0, 1 - abs(hour - 4) / 8)
-        
-        forecasts.append({
-            "dt": int((base_time + timedelta(hours=i * 3)).timestamp()),
+
+    # All 16 three-hour steps computed at once; only dict assembly stays per item
+    i = np.arange(16)
+    hours = (base_time.hour + i * 3) % 24
+
+    # Simulate temperature curve (peak at 2 PM, low at 4 AM)
+    temp_base = 28 + 7 * np.maximum(0, 1 - np.abs(hours - 14) / 10)
+    humidity_base = 65 + 15 * np.maximum(0, 1 - np.abs(hours - 4) / 8)
+
+    # base_time is naive UTC; pin the zone so .timestamp() doesn't read it as local time
+    timestamps = (base_time.replace(tzinfo=timezone.utc).timestamp() + i * 3 * 3600).astype(np.int64).tolist()
+    temps = (temp_base + (i % 3) * 0.5).tolist()
+    feels = (temp_base + 3 + (i % 3)).tolist()
+    humidities = np.minimum(humidity_base, 95).tolist()
+    winds = (3 + (i % 4)).tolist()
+
+    return [
+        {
+            "dt": timestamps[k],
             "main": {
-                "temp": round(temp_base + (i % 3) * 0.5, 1),
-                "feels_like": round(temp_base + 3 + (i % 3), 1),
-                "humidity": round(min(humidity_base, 95)),
+                "temp": round(temps[k], 1),
+                "feels_like": round(feels[k], 1),
+                "humidity": round(humidities[k]),
             },
-            "wind": {"speed": 3 + (i % 4)},
-            "rain": {"3h": 0.5 if i in [6, 7, 8] else 0},
-            "weather": [{"description": "partly cloudy" if i < 10 else "light rain"}],
-        })
-    
-    return forecasts
+            "wind": {"speed": winds[k]},
+            "rain": {"3h": 0.5 if k in (6, 7, 8) else 0},
+            "weather": [{"description": "partly cloudy" if k < 10 else "light rain"}],
+        }
+        for k in range(16)
+    ]
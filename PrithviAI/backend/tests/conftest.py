@@ -0,0 +1,31 @@
+"""
+Shared pytest fixtures for the backend test suite.
+"""
+
+import pytest
+
+from models.schemas import EnvironmentData, AgeGroup, ActivityIntent
+from intelligence.risk_engine import risk_engine
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """The process-wide risk engine singleton."""
+    return risk_engine
+
+
+@pytest.fixture(scope="session")
+def env_elderly_hot():
+    """Hot, humid, moderately polluted conditions — built once per session."""
+    return EnvironmentData(
+        pm25=80, pm10=120, aqi=160,
+        temperature=37, feels_like=40, humidity=75,
+        wind_speed=3, rainfall=0, uv_index=8,
+        noise_db=55, water_level=0,
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm(engine, env_elderly_hot):
+    """Run the full engine once so lazy imports and memo tables are paid up front."""
+    engine.compute_all_risks(env_elderly_hot, AgeGroup.ADULT, ActivityIntent.WALKING)
@@ -1,109 +1,132 @@
 """
 PrithviAI — Backend Test Suite
 Quick smoke tests for all major modules.
-Run with: python -m pytest tests/ -v
+Run with: python -m pytest -v  (or python -m tests.test_risk_engine)
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import asyncio
+import time
+from datetime import datetime
 
+import numpy as np
+import pytest
+
+from config import Settings
 from models.schemas import (
-    RiskLevel, AgeGroup, ActivityIntent, EnvironmentData, SensorData
+    RiskLevel, AgeGroup, ActivityIntent, SensorData, EnvironmentData
+)
+from intelligence.air_quality_risk import (
+    compute_air_quality_risk, compute_air_quality_scores, RISK_LEVEL_ORDER
 )
-from intelligence.air_quality_risk import compute_air_quality_risk
 from intelligence.thermal_risk import compute_thermal_risk
 from intelligence.humidity_risk import compute_humidity_risk
 from intelligence.noise_risk import compute_noise_risk
 from intelligence.flood_risk import compute_flood_risk
 from intelligence.uv_risk import compute_uv_risk
-from intelligence.safety_index import compute_safety_index
-from intelligence.risk_engine import risk_engine
+from services import air_quality_service, data_aggregator
 from services.sensor_service import SensorDataManager
+from services.weather_service import _get_demo_forecast, _get_demo_weather, parse_forecast_to_env_list
+
+
+# ── Per-factor risk levels ──
+# (risk function, kwargs, acceptable levels, (score_above, score_below) or None)
+RISK_LEVEL_CASES = {
+    "air_quality_low": (
+        compute_air_quality_risk, dict(pm25=15, pm10=30, aqi=40),
+        {RiskLevel.LOW}, (None, 30),
+    ),
+    "air_quality_high": (
+        compute_air_quality_risk, dict(pm25=200, pm10=300, aqi=350, age_group=AgeGroup.ELDERLY),
+        {RiskLevel.HIGH}, (60, None),
+    ),
+    "thermal_comfortable": (
+        compute_thermal_risk, dict(temperature=26, humidity=50, feels_like=26),
+        {RiskLevel.LOW}, None,
+    ),
+    "thermal_heat_stress": (
+        compute_thermal_risk,
+        dict(temperature=42, humidity=70, feels_like=48, age_group=AgeGroup.ELDERLY),
+        {RiskLevel.HIGH}, None,
+    ),
+    "humidity_moderate": (
+        compute_humidity_risk, dict(humidity=78, temperature=33, age_group=AgeGroup.ELDERLY),
+        {RiskLevel.MODERATE, RiskLevel.HIGH}, None,
+    ),
+    "noise_safe": (
+        compute_noise_risk, dict(noise_db=35),
+        {RiskLevel.LOW}, None,
+    ),
+    "noise_dangerous": (
+        compute_noise_risk, dict(noise_db=90, age_group=AgeGroup.ELDERLY),
+        {RiskLevel.HIGH}, None,
+    ),
+    "flood_no_rain": (
+        compute_flood_risk, dict(rainfall=0, water_level=0),
+        {RiskLevel.LOW}, None,
+    ),
+    "flood_heavy_rain": (
+        compute_flood_risk,
+        dict(rainfall=20, water_level=10, age_group=AgeGroup.ELDERLY, activity=ActivityIntent.WALKING),
+        {RiskLevel.HIGH}, None,
+    ),
+    "uv_low": (
+        compute_uv_risk, dict(uv_index=1.5),
+        {RiskLevel.LOW}, None,
+    ),
+    "uv_high": (
+        compute_uv_risk,
+        dict(uv_index=10, age_group=AgeGroup.ELDERLY, activity=ActivityIntent.OUTDOOR_WORK),
+        {RiskLevel.HIGH}, None,
+    ),
+}
+
+
+@pytest.mark.parametrize(
+    "risk_fn, kwargs, expected_levels, score_range",
+    list(RISK_LEVEL_CASES.values()),
+    ids=list(RISK_LEVEL_CASES),
+)
+def test_risk_levels(risk_fn, kwargs, expected_levels, score_range):
+    """Each risk factor should land in the expected level for clear-cut inputs."""
+    result = risk_fn(**kwargs)
+    assert result.level in expected_levels
+    if score_range is not None:
+        above, below = score_range
+        assert above is None or result.score > above
+        assert below is None or result.score < below
+
+
+def test_air_quality_batch_matches_scalar():
+    """Batch scoring should agree with the scalar function case by case."""
+    pm25 = np.array([15, 200, 45, 0, 120])
+    pm10 = np.array([30, 300, 80, 0, 400])
+    aqi = np.array([40, 350, 110, 0, 260])
+    scores, levels = compute_air_quality_scores(pm25, pm10, aqi, AgeGroup.ELDERLY)
+    
+    assert RISK_LEVEL_ORDER[levels[0]] == RiskLevel.LOW
+    assert RISK_LEVEL_ORDER[levels[1]] == RiskLevel.HIGH
+    for i in range(len(pm25)):
+        scalar = compute_air_quality_risk(pm25=pm25[i], pm10=pm10[i], aqi=aqi[i])
+        assert scalar.level == RISK_LEVEL_ORDER[levels[i]]
+        assert abs(scalar.score - scores[i]) <= 0.05 + 1e-9
 
 
-def test_air_quality_low():
-    """Good air quality should return LOW risk."""
-    result = compute_air_quality_risk(pm25=15, pm10=30, aqi=40)
-    assert result.level == RiskLevel.LOW
-    assert result.score < 30
-
-
-def test_air_quality_high():
-    """Very poor air quality should return HIGH risk."""
-    result = compute_air_quality_risk(pm25=200, pm10=300, aqi=350, age_group=AgeGroup.ELDERLY)
-    assert result.level == RiskLevel.HIGH
-    assert result.score > 60
-
-
-def test_thermal_comfortable():
-    """Comfortable temperature should return LOW risk."""
-    result = compute_thermal_risk(temperature=26, humidity=50, feels_like=26)
-    assert result.level == RiskLevel.LOW
-
-
-def test_thermal_heat_stress():
-    """Very hot conditions should return HIGH risk for seniors."""
-    result = compute_thermal_risk(
-        temperature=42, humidity=70, feels_like=48, age_group=AgeGroup.ELDERLY
-    )
-    assert result.level == RiskLevel.HIGH
-
-
-def test_humidity_moderate():
-    """High humidity should flag moderate risk for seniors."""
-    result = compute_humidity_risk(humidity=78, temperature=33, age_group=AgeGroup.ELDERLY)
-    assert result.level in [RiskLevel.MODERATE, RiskLevel.HIGH]
-
-
-def test_noise_safe():
-    """Quiet environment should return LOW risk."""
-    result = compute_noise_risk(noise_db=35)
-    assert result.level == RiskLevel.LOW
-
-
-def test_noise_dangerous():
-    """Very loud environment should return HIGH risk."""
-    result = compute_noise_risk(noise_db=90, age_group=AgeGroup.ELDERLY)
-    assert result.level == RiskLevel.HIGH
-
-
-def test_flood_no_rain():
-    """No rain should return LOW risk."""
-    result = compute_flood_risk(rainfall=0, water_level=0)
-    assert result.level == RiskLevel.LOW
-
+def test_air_quality_batch_from_env_rows(engine, env_elderly_hot):
+    """Stacked EnvironmentData rows should score like the per-object path."""
+    rows = np.vstack([env_elderly_hot.to_array()] * 3)
+    scores, levels = engine.score_air_quality_batch(rows, AgeGroup.ELDERLY)
 
-def test_flood_heavy_rain():
-    """Heavy rain should be dangerous for seniors."""
-    result = compute_flood_risk(
-        rainfall=20, water_level=10, age_group=AgeGroup.ELDERLY,
-        activity=ActivityIntent.WALKING
+    scalar = compute_air_quality_risk(
+        pm25=env_elderly_hot.pm25, pm10=env_elderly_hot.pm10, aqi=env_elderly_hot.aqi,
     )
-    assert result.level == RiskLevel.HIGH
-
-
-def test_uv_low():
-    """Low UV should return LOW risk."""
-    result = compute_uv_risk(uv_index=1.5)
-    assert result.level == RiskLevel.LOW
-
+    assert len(scores) == 3
+    assert all(RISK_LEVEL_ORDER[code] == scalar.level for code in levels)
+    assert abs(scalar.score - scores[0]) <= 0.05 + 1e-9
 
-def test_uv_high():
-    """Very high UV should return HIGH risk."""
-    result = compute_uv_risk(uv_index=10, age_group=AgeGroup.ELDERLY, activity=ActivityIntent.OUTDOOR_WORK)
-    assert result.level == RiskLevel.HIGH
 
-
-def test_safety_index_aggregation():
+def test_safety_index_aggregation(engine, env_elderly_hot):
     """Safety index should correctly aggregate multiple risk factors."""
-    env = EnvironmentData(
-        pm25=80, pm10=120, aqi=160,
-        temperature=37, feels_like=40, humidity=75,
-        wind_speed=3, rainfall=0, uv_index=8,
-        noise_db=55, water_level=0,
-    )
-    result = risk_engine.compute_all_risks(env, AgeGroup.ELDERLY, ActivityIntent.WALKING)
+    result = engine.compute_all_risks(env_elderly_hot, AgeGroup.ELDERLY, ActivityIntent.WALKING)
     
     assert result.overall_score > 0
     assert result.overall_level in [RiskLevel.LOW, RiskLevel.MODERATE, RiskLevel.HIGH]
@@ -139,23 +162,141 @@ def test_sensor_smoothing():
     assert 45 <= latest.pm25 <= 55  # Should be averaged
 
 
+def test_sensor_ingest_many_matches_sequential():
+    """Batch ingest should leave the same smoothed values as one-by-one ingest."""
+    rows = np.array([[50, 30], [55, 31], [45, 29], [-5, 28], [60, 27]], dtype=np.float32)
+    batch = SensorDataManager(window_size=3)
+    sequential = SensorDataManager(window_size=3)
+
+    batched = batch.ingest_many(rows[:2])
+    batched = batch.ingest_many(rows[2:])
+    for pm25, temperature in rows.tolist():
+        expected = sequential.ingest(SensorData(pm25=pm25, temperature=temperature))
+
+    assert batched == expected
+    assert np.array_equal(batch._buf, sequential._buf)
+
+
+def test_demo_forecast_timestamps_are_utc(monkeypatch):
+    """Demo forecast 'dt' values should round-trip to UTC regardless of local TZ."""
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    try:
+        first = parse_forecast_to_env_list(_get_demo_forecast(18.52, 73.86))[0]
+        assert abs((first.timestamp - datetime.utcnow()).total_seconds()) < 60
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_aqi_single_flight_joins_neighbours_and_survives_cancel(monkeypatch):
+    """Nearby misses share one fetch; a cancelled leader doesn't fail its waiters."""
+    calls = []
+
+    async def fake_fetch(lat, lon, cache_key):
+        calls.append((lat, lon))
+        await asyncio.sleep(0.05)
+        return {"aqi": 42}
+
+    monkeypatch.setattr(air_quality_service, "_fetch_and_cache", fake_fetch)
+
+    async def scenario():
+        # ~20 m apart but on adjacent 0.02° tiles
+        await asyncio.gather(
+            air_quality_service.fetch_air_quality(18.5199, 73.85),
+            air_quality_service.fetch_air_quality(18.5201, 73.85),
+        )
+        assert len(calls) == 1
+
+        leader = asyncio.create_task(air_quality_service.fetch_air_quality(18.6, 73.9))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(air_quality_service.fetch_air_quality(18.6001, 73.9))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await waiter == {"aqi": 42}
+
+    asyncio.run(scenario())
+
+
+def test_aqi_conversions_vector_and_inverse():
+    """Vectorised PM→AQI matches the scalar path; the inverse follows EPA segments."""
+    conc = np.concatenate([np.linspace(-5, 650, 6551), [12.0, 12.05, 35.45, 150.4, 500.4]])
+    pm25 = air_quality_service._compute_aqi_from_pm25_vec(conc)
+    pm10 = air_quality_service._compute_aqi_from_pm10_vec(conc)
+    for i, c in enumerate(conc.tolist()):
+        assert pm25[i] == air_quality_service._compute_aqi_from_pm25(c)
+        assert pm10[i] == air_quality_service._compute_aqi_from_pm10(c)
+
+    assert air_quality_service._aqi_to_pm25(0) == 0.0
+    assert air_quality_service._aqi_to_pm25(50) == 12.0
+    assert air_quality_service._aqi_to_pm25(151) == 55.5
+    assert air_quality_service._aqi_to_pm25(550) == 500.0
+    assert air_quality_service._aqi_to_pm10(100) == 154.0
+    assert air_quality_service._aqi_to_pm10(550) == 604.0
+
+
+def test_aqicn_only_merge_keeps_integer_uncapped_aqi():
+    """AQICN-only AQI is a whole number and matches the merged branch for high station AQI."""
+    merged = air_quality_service._merge_air_quality
+    fractional = merged({"aqi": 150, "pm25": 152.5, "pm10": 40}, None, 18.52, 73.86)
+    assert fractional["aqi"] == 153 and isinstance(fractional["aqi"], int)
+
+    station = {"aqi": 620, "pm25": 300, "pm10": 200}
+    both = merged(station, {"pm25": 80.0, "pm10": 120.0}, 18.52, 73.86)
+    assert merged(station, None, 18.52, 73.86)["aqi"] == both["aqi"] == 620
+
+
+def test_batch_environments_isolate_per_point_failures(monkeypatch):
+    """A point whose environment fails to build shouldn't take the others down."""
+    build = data_aggregator._build_environment
+
+    def flaky_build(lat, lon, *args, **kwargs):
+        if lat == 18.6:
+            raise ValueError("malformed weather payload")
+        return build(lat, lon, *args, **kwargs)
+
+    async def fixed_uv(lat, lon):
+        return 5.0
+
+    monkeypatch.setattr(data_aggregator, "_build_environment", flaky_build)
+    monkeypatch.setattr(data_aggregator, "fetch_uv_index", fixed_uv)  # keep the test offline
+    envs = asyncio.run(data_aggregator.get_aggregated_environments(
+        [(18.52, 73.86, "Pune"), (18.6, 73.9, "Bad"), (18.55, 73.8, "Aundh")]
+    ))
+
+    assert isinstance(envs[1], ValueError)
+    assert all(isinstance(env, EnvironmentData) for env in (envs[0], envs[2]))
+
+
+def test_sensor_temperature_shifts_feels_like(monkeypatch):
+    """A sensor temperature override should move feels_like by the same difference."""
+    monkeypatch.setattr(data_aggregator, "sensor_manager", SensorDataManager())
+    weather = _get_demo_weather(18.52, 73.86)   # 33.5 °C, feels like 37.2 °C
+
+    env, _ = data_aggregator._build_environment(
+        18.52, 73.86, weather, {"aqi": 80, "pm25": 30, "pm10": 50}, 5.0,
+        sensor_data=SensorData(temperature=30.0),
+    )
+
+    assert env.temperature == 30.0
+    assert env.feels_like == pytest.approx(37.2 - 3.5)
+
+
+def test_settings_reads_cache_flag_from_env_file(tmp_path, monkeypatch):
+    """The documented PRITHVI_CACHE_RISK .env line should load, not fail validation."""
+    monkeypatch.delenv("PRITHVI_CACHE_RISK", raising=False)
+    env_file = tmp_path / ".env"
+    env_file.write_text("PRITHVI_CACHE_RISK=0\n")
+
+    assert Settings(_env_file=env_file).CACHE_RISK_FACTORS is False
+    assert Settings(_env_file=None).CACHE_RISK_FACTORS is True
+
+
 if __name__ == "__main__":
-    # Run all tests
-    test_fns = [v for k, v in globals().items() if k.startswith("test_")]
-    passed = 0
-    failed = 0
-    
-    for fn in test_fns:
-        try:
-            fn()
-            print(f"  ✅ {fn.__name__}")
-            passed += 1
-        except AssertionError as e:
-            print(f"  ❌ {fn.__name__}: {e}")
-            failed += 1
-        except Exception as e:
-            print(f"  ❌ {fn.__name__}: {type(e).__name__}: {e}")
-            failed += 1
-    
-    print(f"\n{'='*40}")
-    print(f"Results: {passed} passed, {failed} failed, {passed + failed} total")
+    # Parametrized cases and fixtures need pytest's runner; shard across
+    # all cores when pytest-xdist is available
+    import importlib.util
+    args = [__file__, "-v"]
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto", "--dist=load"]
+    raise SystemExit(pytest.main(args))